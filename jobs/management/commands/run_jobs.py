@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Воркер очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и выйти.')
+        parser.add_argument('--batch', type=int, default=100,
+                            help='Задач за один проход.')
+        parser.add_argument('--sleep', type=float, default=1,
+                            help='Пауза, когда очередь пуста, секунд.')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Через сколько секунд задача со статусом '
+                                 '«выполняется» считается брошенной.')
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options['stale_after'])
+        while True:
+            requeue_stale(stale_after)
+            processed = run_pending(options['batch'])
+            if processed:
+                self.stdout.write(f'Выполнено задач: {processed}')
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['sleep'])
@@ -0,0 +1,117 @@
+"""Простая очередь фоновых задач в базе данных.
+
+Задача — функция, зарегистрированная декоратором ``@task``; аргументы
+передаются именованными и должны сериализоваться в JSON. Представления
+только ставят задачу в очередь через ``enqueue``, а выполняет её воркер
+``python manage.py run_jobs``.
+"""
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+# Пауза перед повтором: RETRY_DELAY * 2 ** (попытка - 1)
+RETRY_DELAY = timedelta(seconds=30)
+
+
+def task(name):
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, priority=0, key=None, delay=None,
+            max_attempts=3):
+    """Ставит задачу в очередь.
+
+    Если задача с таким ключом идемпотентности уже есть, новая не
+    создаётся и возвращается существующая.
+    """
+    if name not in registry:
+        raise KeyError(f'Задача {name} не зарегистрирована')
+    fields = {
+        'name': name,
+        'payload': json.dumps(payload or {}),
+        'priority': priority,
+        'max_attempts': max_attempts,
+        'run_at': timezone.now() + (delay or timedelta()),
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(idempotency_key=key, **fields)
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=key)
+
+
+def claim(limit):
+    """Забирает до limit готовых задач; параллельные воркеры не мешают.
+
+    Задача достаётся тому воркеру, чей UPDATE первым сменил её статус.
+    """
+    candidates = Job.objects.filter(
+        status=Job.QUEUED, run_at__lte=timezone.now()).order_by(
+        '-priority', 'run_at', 'id').values_list('id', flat=True)[:limit]
+    claimed = []
+    for job_id in candidates:
+        updated = Job.objects.filter(id=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING, attempts=F('attempts') + 1,
+            updated=timezone.now())
+        if updated:
+            claimed.append(job_id)
+    return Job.objects.filter(id__in=claimed).order_by(
+        '-priority', 'run_at', 'id')
+
+
+def run(job):
+    func = registry.get(job.name)
+    try:
+        if func is None:
+            raise KeyError(f'Задача {job.name} не зарегистрирована')
+        with transaction.atomic():
+            func(**json.loads(job.payload))
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', job)
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+        else:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + RETRY_DELAY * 2 ** (
+                job.attempts - 1)
+    else:
+        job.status = Job.DONE
+    job.save(update_fields=['status', 'run_at', 'last_error', 'updated'])
+    return job.status == Job.DONE
+
+
+def requeue_stale(timeout):
+    """Возвращает в очередь задачи, зависшие у упавшего воркера."""
+    return Job.objects.filter(
+        status=Job.RUNNING, updated__lt=timezone.now() - timeout).update(
+        status=Job.QUEUED, updated=timezone.now())
+
+
+def run_pending(limit=100):
+    """Выполняет готовые задачи, возвращает число обработанных."""
+    processed = 0
+    while processed < limit:
+        jobs = list(claim(min(10, limit - processed)))
+        if not jobs:
+            break
+        for job in jobs:
+            run(job)
+        processed += len(jobs)
+    return processed
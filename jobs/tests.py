@@ -0,0 +1,111 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import enqueue, registry, run_pending, task
+
+User = get_user_model()
+
+calls = []
+
+
+@task('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('tests.fail')
+def fail():
+    raise ValueError('Ошибка')
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_by_priority(self):
+        enqueue('tests.record', {'value': 'обычная'})
+        enqueue('tests.record', {'value': 'срочная'}, priority=10)
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, ['срочная', 'обычная'])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 2)
+
+    def test_idempotency_key_prevents_duplicates(self):
+        first = enqueue('tests.record', {'value': 1}, key='record:1')
+        second = enqueue('tests.record', {'value': 1}, key='record:1')
+        self.assertEqual(first.pk, second.pk)
+        run_pending()
+        self.assertEqual(calls, [1])
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job = enqueue('tests.fail', max_attempts=2)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('ValueError', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_delayed_job_waits(self):
+        enqueue('tests.record', {'value': 1},
+                delay=timezone.timedelta(hours=1))
+        self.assertEqual(run_pending(), 0)
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(KeyError):
+            enqueue('tests.unknown')
+
+    def test_run_jobs_command(self):
+        enqueue('tests.record', {'value': 1})
+        out = StringIO()
+        call_command('run_jobs', once=True, stdout=out)
+        self.assertEqual(calls, [1])
+        self.assertIn('Выполнено задач: 1', out.getvalue())
+
+
+class PostJobsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_new_post_with_image_enqueues_thumbnail(self):
+        small_gif = (
+            b'\x47\x49\x46\x38\x39\x61\x02\x00'
+            b'\x01\x00\x80\x00\x00\x00\x00\x00'
+            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+            b'\x0A\x00\x3B'
+        )
+        self.authorized_client.post(reverse('posts:new_post'), data={
+            'text': 'Пост с картинкой',
+            'image': SimpleUploadedFile('small.gif', small_gif,
+                                        content_type='image/gif'),
+        })
+        job = Job.objects.get(name='posts.generate_thumbnail')
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn('posts.generate_thumbnail', registry)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+
+    def test_new_post_without_image_enqueues_nothing(self):
+        self.authorized_client.post(reverse('posts:new_post'),
+                                    data={'text': 'Просто текст'})
+        self.assertFalse(Job.objects.exists())
@@ -1,16 +1,159 @@
-from django.contrib import admin
+import hashlib
+from collections import Counter
 
-from .models import Comment, Follow, Group, Post
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
 
+from .models import (ArchivedComment, ArchivedPost, Comment, Follow, Group,
+                     Post)
+from .moderation import delete_comments, move_posts, purge_content
 
-class PostAdmin(admin.ModelAdmin):
+User = get_user_model()
+
+PREVIEW_LENGTH = 80
+
+
+class CachedCountPaginator(Paginator):
+    """Число строк списка кэшируется по тексту запроса, чтобы changelist
+    не считал COUNT(*) по всей таблице на каждом заходе."""
+
+    @cached_property
+    def count(self):
+        query = str(self.object_list.query).encode()
+        key = 'admin:count:' + hashlib.md5(query).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(key, count, settings.ADMIN_COUNT_TIMEOUT)
+        return count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Настройки списка для таблиц на миллионы строк."""
+    paginator = CachedCountPaginator
+    # Не считать строки без фильтра второй раз ради «всего N»
+    show_full_result_count = False
+    empty_value_display = "-пусто-"
+
+
+def counts_by_author(model, authors):
+    return Counter(dict(model.objects.filter(author__in=authors).order_by(
+        ).values('author').annotate(count=Count('id')).values_list(
+        'author', 'count')))
+
+
+def confirm_authors_action(modeladmin, request, queryset, authors, action,
+                           with_posts=False):
+    """Страница подтверждения, как у delete_selected: авторы и сколько
+    их записей, включая архивные, будет удалено.
+
+    Возвращает None, если действие уже подтверждено.
+    """
+    if request.POST.get('post'):
+        return None
+    comments = (counts_by_author(Comment, authors)
+                + counts_by_author(ArchivedComment, authors))
+    if with_posts:
+        posts = (counts_by_author(Post, authors)
+                 + counts_by_author(ArchivedPost, authors))
+    authors = list(authors.order_by('username'))
+    for author in authors:
+        author.comment_count = comments[author.id]
+        author.post_count = posts[author.id] if with_posts else None
+    opts = modeladmin.model._meta
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        'title': 'Вы уверены?',
+        'description': getattr(modeladmin, action).short_description,
+        'opts': opts,
+        'authors': authors,
+        'selected': queryset.values_list('pk', flat=True),
+        'action': action,
+        'action_checkbox_name': ACTION_CHECKBOX_NAME,
+        'media': modeladmin.media,
+    }
+    request.current_app = modeladmin.admin_site.name
+    return TemplateResponse(
+        request, 'admin/posts/confirm_authors_action.html', context)
+
+
+class MovePostsActionForm(ActionForm):
+    # slug, а не список: выпадающий список грузил бы все группы.
+    # Необязательное для формы, но обязательное для move_to_group: другим
+    # действиям оно не нужно
+    group = forms.SlugField(required=False, label='slug группы')
+
+
+class PostAdmin(LargeTableAdmin):
     # перечисляем поля, которые должны отображаться в админке
-    list_display = ("pk", "text", "pub_date", "author")
+    list_display = ("pk", "text", "pub_date", "author", "group", "status")
+    # автор и группа приходят тем же запросом, что и посты
+    list_select_related = ("author", "group")
     # добавляем интерфейс для поиска по тексту постов
     search_fields = ("text",)
     # добавляем возможность фильтрации по дате
-    list_filter = ("pub_date",)
-    empty_value_display = "-пусто-"
+    list_filter = ("pub_date", "status")
+    date_hierarchy = "pub_date"
+    # вместо выпадающих списков из всех пользователей и групп
+    raw_id_fields = ("author", "group")
+
+    def get_list_display(self, request):
+        # Поле модели в list_display выводится целиком, даже если у
+        # ModelAdmin есть метод с тем же именем, поэтому текст подменяется
+        # укороченным здесь
+        return tuple('text_preview' if name == 'text' else name
+                     for name in super().get_list_display(request))
+
+    def text_preview(self, post):
+        return Truncator(post.text).chars(PREVIEW_LENGTH)
+    text_preview.short_description = 'Текст'
+
+    # Массовые действия выполняются одним запросом, см. posts.moderation
+    action_form = MovePostsActionForm
+    actions = ('move_to_group', 'remove_from_group', 'purge_authors')
+
+    def move_to_group(self, request, queryset):
+        # Поле group приходит из action_form вместе с выбранным действием
+        slug = request.POST.get('group', '').strip()
+        if not slug:
+            self.message_user(request, 'Укажите slug группы',
+                              messages.ERROR)
+            return
+        group = Group.objects.filter(slug=slug).first()
+        if group is None:
+            self.message_user(request, f'Группа {slug} не найдена',
+                              messages.ERROR)
+            return
+        moved = move_posts(queryset, group)
+        self.message_user(request, f'Перенесено постов: {moved}')
+    move_to_group.short_description = 'Перенести в группу'
+
+    def remove_from_group(self, request, queryset):
+        moved = move_posts(queryset, None)
+        self.message_user(request, f'Убрано из групп постов: {moved}')
+    remove_from_group.short_description = 'Убрать из группы'
+
+    def purge_authors(self, request, queryset):
+        authors = User.objects.filter(id__in=queryset.values('author_id'))
+        confirmation = confirm_authors_action(
+            self, request, queryset, authors, 'purge_authors',
+            with_posts=True)
+        if confirmation is not None:
+            return confirmation
+        deleted = purge_content(authors)
+        self.message_user(request, f'Удалено записей: {deleted}',
+                          messages.WARNING)
+    purge_authors.short_description = 'Удалить все посты и комментарии авторов'
+    purge_authors.allowed_permissions = ('delete',)
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -23,12 +166,43 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = "-пусто-"
 
 
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ('text', 'created', 'author', 'post')
+class CommentAdmin(LargeTableAdmin):
+    list_display = ('text_preview', 'created', 'author', 'post_preview')
+    list_select_related = ('author', 'post')
+    date_hierarchy = 'created'
+    raw_id_fields = ('author', 'post')
+
+    def text_preview(self, comment):
+        return Truncator(comment.text).chars(PREVIEW_LENGTH)
+    text_preview.short_description = 'Комментарий'
+
+    actions = ('delete_authors_comments',)
+
+    def delete_authors_comments(self, request, queryset):
+        authors = User.objects.filter(id__in=queryset.values('author_id'))
+        confirmation = confirm_authors_action(
+            self, request, queryset, authors, 'delete_authors_comments')
+        if confirmation is not None:
+            return confirmation
+        deleted = delete_comments(authors)
+        self.message_user(request, f'Удалено комментариев: {deleted}',
+                          messages.WARNING)
+    delete_authors_comments.short_description = (
+        'Удалить все комментарии авторов')
+    delete_authors_comments.allowed_permissions = ('delete',)
+
+    def post_preview(self, comment):
+        # str(post) — это весь текст поста
+        if comment.post is None:
+            return None
+        return Truncator(comment.post.text).chars(PREVIEW_LENGTH // 2)
+    post_preview.short_description = 'Пост'
 
 
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(LargeTableAdmin):
     list_display = ('user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
 
 
 # при регистрации модели Post источником конфигурации для неё назначаем
@@ -0,0 +1,98 @@
+"""Архивирование старых постов.
+
+Посты старше ARCHIVE_AFTER_DAYS переносятся вместе с комментариями в
+таблицы ArchivedPost и ArchivedComment, так что posts_post и его индексы
+содержат только свежие записи, с которыми работают ленты. Страница поста
+и профиль автора по-прежнему показывают архивные записи.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cache import invalidate_follow_counts
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+POST_FIELDS = ('id', 'text', 'pub_date', 'author_id', 'group_id', 'image')
+COMMENT_FIELDS = ('id', 'post_id', 'author_id', 'text', 'created')
+
+
+def archive_batch(before, batch_size):
+    """Переносит в архив до batch_size постов, возвращает их число."""
+    with transaction.atomic():
+        ids = list(Post.objects.published().filter(
+            pub_date__lt=before).order_by('id').values_list(
+            'id', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        posts = Post.objects.filter(id__in=ids)
+        comments = Comment.objects.filter(post_id__in=ids)
+        rows = list(posts.values(*POST_FIELDS))
+        ArchivedPost.objects.bulk_create(ArchivedPost(**row) for row in rows)
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**row)
+            for row in comments.values(*COMMENT_FIELDS))
+        # Сначала комментарии: иначе SET_NULL оставит их без поста
+        comments.delete()
+        posts.delete()
+    # Удаление постов сбрасывает счётчики групп сигналами, а ленты
+    # подписок читателей этих авторов стали короче
+    invalidate_follow_counts({row['author_id'] for row in rows})
+    return len(ids)
+
+
+def archive_posts(before=None, batch_size=1000):
+    """Архивирует посты, опубликованные раньше before, пачками в отдельных
+    транзакциях. Возвращает число перенесённых постов."""
+    before = before or timezone.now() - timedelta(
+        days=settings.ARCHIVE_AFTER_DAYS)
+    total = 0
+    while True:
+        moved = archive_batch(before, batch_size)
+        if not moved:
+            return total
+        total += moved
+
+
+class ArchiveChain:
+    """Свежие посты, а за ними архивные, как одна последовательность.
+
+    Годится для Paginator: архив читается, только когда страница
+    заходит за последний свежий пост.
+    """
+
+    def __init__(self, posts, archived):
+        self.posts = posts
+        self.archived = archived
+
+    @cached_property
+    def posts_count(self):
+        return self.posts.count()
+
+    @cached_property
+    def total(self):
+        return self.posts_count + self.archived.count()
+
+    def count(self):
+        return self.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            items = self[index:index + 1]
+            if not items:
+                raise IndexError(index)
+            return items[0]
+        start = index.start or 0
+        stop = self.total if index.stop is None else index.stop
+        items = []
+        if start < self.posts_count:
+            items += self.posts[start:min(stop, self.posts_count)]
+        if stop > self.posts_count:
+            items += self.archived[max(start - self.posts_count, 0):
+                                   stop - self.posts_count]
+        return items
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Max, Q
+
+from .models import Follow, Group, Post
+
+GROUP_DIRECTORY_KEY = 'posts:group_directory'
+
+
+def group_directory():
+    """Все группы с числом постов и датой последнего — одним запросом."""
+    groups = cache.get(GROUP_DIRECTORY_KEY)
+    if groups is None:
+        published = Q(posts__status=Post.PUBLISHED)
+        groups = list(Group.objects.annotate(
+            post_count=Count('posts', filter=published),
+            last_post=Max('posts__pub_date', filter=published),
+        ).order_by('title').values(
+            'title', 'slug', 'description', 'post_count', 'last_post'))
+        cache.set(GROUP_DIRECTORY_KEY, groups,
+                  settings.GROUP_DIRECTORY_TIMEOUT)
+    return groups
+
+
+def invalidate_group_directory():
+    cache.delete(GROUP_DIRECTORY_KEY)
+
+
+def following_key(user_id):
+    return f'posts:following:{user_id}'
+
+
+def following_ids(user):
+    """id авторов, на которых подписан user, — одним запросом на кэш."""
+    if not user.is_authenticated:
+        return frozenset()
+    key = following_key(user.id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Follow.objects.filter(user=user).values_list(
+            'author_id', flat=True))
+        cache.set(key, ids, settings.FOLLOWING_TIMEOUT)
+    return ids
+
+
+def invalidate_following(user_id):
+    cache.delete(following_key(user_id))
+
+
+def feed_count_key(feed, object_id):
+    return f'posts:count:{feed}:{object_id}'
+
+
+def counted_paginator(object_list, per_page, key):
+    """Paginator, который берёт число записей из кэша, а не COUNT(*).
+
+    Число может немного отставать от базы (FEED_COUNT_TIMEOUT), поэтому
+    ключи ещё и сбрасываются сигналами там, где это дёшево.
+    """
+    paginator = Paginator(object_list, per_page)
+    count = cache.get(key)
+    if count is None:
+        cache.set(key, paginator.count, settings.FEED_COUNT_TIMEOUT)
+    else:
+        paginator.count = count
+    return paginator
+
+
+def invalidate_feed_counts(feed, object_ids):
+    cache.delete_many([feed_count_key(feed, object_id)
+                       for object_id in object_ids if object_id])
+
+
+def invalidate_follow_counts(authors):
+    """Сбрасывает число постов в лентах подписок читателей authors."""
+    invalidate_feed_counts('follow', Follow.objects.filter(
+        author__in=authors).values_list('user_id', flat=True))
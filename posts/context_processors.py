@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from .cache import following_ids
+
+
+def following(request):
+    """id авторов, на которых подписан текущий пользователь.
+
+    Множество берётся из кэша и только если шаблон к нему обратился.
+    """
+    return {'followed_authors': SimpleLazyObject(
+        lambda: following_ids(request.user))}
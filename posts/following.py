@@ -0,0 +1,50 @@
+"""Массовая подписка и отписка по списку имён пользователей."""
+import re
+
+from django.contrib.auth import get_user_model
+
+from .cache import invalidate_feed_counts, invalidate_following
+from .models import Follow
+
+User = get_user_model()
+
+# Имена в списке разделяются пробелами, запятыми или переводами строк;
+# ведущий @ допускается, как в ссылках на авторов
+SEPARATORS = re.compile(r'[\s,;]+')
+
+
+def parse_usernames(text):
+    """Уникальные имена из текста в порядке появления."""
+    names = (name.lstrip('@') for name in SEPARATORS.split(text))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def follow_many(user, usernames):
+    """Подписывает user на авторов из списка.
+
+    Возвращает (число новых подписок, неизвестные имена). Имена
+    разрешаются одним запросом, подписки вставляются одним bulk_create;
+    уже существующие пропускает уникальный индекс (user, author).
+    """
+    authors = dict(User.objects.filter(username__in=usernames).values_list(
+        'username', 'id'))
+    missing = [name for name in usernames if name not in authors]
+    author_ids = set(authors.values()) - {user.id}
+    existing = set(Follow.objects.filter(
+        user=user, author_id__in=author_ids).values_list(
+        'author_id', flat=True))
+    Follow.objects.bulk_create(
+        [Follow(user=user, author_id=author_id)
+         for author_id in author_ids - existing],
+        ignore_conflicts=True)
+    # bulk_create не посылает сигналов
+    invalidate_following(user.id)
+    invalidate_feed_counts('follow', [user.id])
+    return len(author_ids - existing), missing
+
+
+def unfollow_many(user, usernames):
+    """Отписывает user от авторов из списка, возвращает число отписок."""
+    deleted, _ = Follow.objects.filter(
+        user=user, author__username__in=usernames).delete()
+    return deleted
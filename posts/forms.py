@@ -1,7 +1,12 @@
+from django import forms
 from django.forms import ModelForm
+from django.utils import timezone
 
+from posts.following import parse_usernames
 from posts.models import Comment, Post
 
+MAX_FOLLOW_IMPORT = 1000
+
 
 class CommentForm(ModelForm):
     class Meta:
@@ -13,3 +18,35 @@ class PostForm(ModelForm):
     class Meta:
         model = Post
         fields = ['text', 'group', 'image']
+
+
+class FollowImportForm(forms.Form):
+    usernames = forms.CharField(
+        label='Имена пользователей', widget=forms.Textarea,
+        help_text='Через пробел, запятую или с новой строки')
+    unfollow = forms.BooleanField(label='Отписаться от них', required=False)
+
+    def clean_usernames(self):
+        usernames = parse_usernames(self.cleaned_data['usernames'])
+        if len(usernames) > MAX_FOLLOW_IMPORT:
+            raise forms.ValidationError(
+                f'Не больше {MAX_FOLLOW_IMPORT} имён за раз')
+        return usernames
+
+
+class PublishForm(forms.Form):
+    """Когда публиковать пост; отдельно от PostForm, чтобы та осталась
+    формой содержимого поста."""
+    draft = forms.BooleanField(label='Сохранить как черновик',
+                               required=False)
+    publish_at = forms.DateTimeField(
+        label='Опубликовать в', required=False,
+        help_text='Оставьте пустым, чтобы опубликовать сразу',
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+        input_formats=['%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M'])
+
+    def clean_publish_at(self):
+        publish_at = self.cleaned_data['publish_at']
+        if publish_at is not None and publish_at <= timezone.now():
+            raise forms.ValidationError('Укажите время в будущем')
+        return publish_at
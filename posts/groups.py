@@ -0,0 +1,33 @@
+"""Массовое создание групп из списка названий."""
+from django.db import transaction
+
+from .cache import invalidate_group_directory
+from .models import Group
+from .slugs import free_slug, slugify_title
+
+
+def import_groups(rows, batch_size=1000):
+    """Создаёт группы из пар (название, описание).
+
+    Возвращает (число созданных, число пропущенных). Пропускаются
+    названия, которые уже есть в базе или повторяются в rows. Названия и
+    слаги всех групп читаются одним запросом, слаги новых групп
+    подбираются в памяти, а сами группы вставляются через bulk_create
+    в одной транзакции: при ошибке в любой пачке не создаётся ничего.
+    """
+    existing = dict(Group.objects.values_list('title', 'slug'))
+    taken = set(existing.values())
+    groups, skipped = {}, 0
+    for title, description in rows:
+        if title in existing or title in groups:
+            skipped += 1
+            continue
+        slug = free_slug(slugify_title(title), taken)
+        taken.add(slug)
+        groups[title] = Group(title=title, slug=slug,
+                              description=description)
+    with transaction.atomic():
+        Group.objects.bulk_create(groups.values(), batch_size=batch_size)
+    # bulk_create не шлёт post_save
+    invalidate_group_directory()
+    return len(groups), skipped
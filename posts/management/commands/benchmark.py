@@ -0,0 +1,160 @@
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.test import Client
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+def percentile(values, percent):
+    """Перцентиль по методу ближайшего ранга для отсортированного списка."""
+    if not values:
+        return 0
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный прогон основных страниц posts: пропускная '
+            'способность и задержки p50/p95/p99.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждый URL.')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--user', help='Пользователь для /follow/. '
+                            'По умолчанию — самый активный подписчик.')
+        parser.add_argument('--output', help='Сохранить результат в JSON.')
+        parser.add_argument('--compare', help='JSON прошлого прогона для '
+                            'сравнения.')
+
+    def handle(self, *args, **options):
+        urls = self.get_urls(options['user'])
+        results = {
+            'revision': git_revision(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'urls': {},
+        }
+        for name, (url, user) in urls.items():
+            self.run(url, user, options['warmup'], 1)
+            timings, elapsed = self.run(url, user, options['requests'],
+                                        options['concurrency'])
+            timings.sort()
+            results['urls'][name] = {
+                'url': url,
+                'rps': round(len(timings) / elapsed, 2),
+                'p50_ms': round(percentile(timings, 50) * 1000, 2),
+                'p95_ms': round(percentile(timings, 95) * 1000, 2),
+                'p99_ms': round(percentile(timings, 99) * 1000, 2),
+            }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+        self.report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+
+    def get_urls(self, username):
+        # Черновики и запланированные посты гостю отдают 404
+        post = Post.objects.published().select_related('author').first()
+        if post is None:
+            raise CommandError('В базе нет опубликованных постов, '
+                               'запустите seed_data.')
+        published = Q(posts__status=Post.PUBLISHED)
+        group = Group.objects.annotate(
+            post_count=Count('posts', filter=published)).order_by(
+            '-post_count').first()
+        author = User.objects.annotate(
+            post_count=Count('posts', filter=published)).order_by(
+            '-post_count').first()
+        if username:
+            reader = User.objects.filter(username=username).first()
+            if reader is None:
+                raise CommandError(f'Пользователь {username} не найден.')
+        else:
+            reader = User.objects.annotate(
+                follow_count=Count('follower')).order_by(
+                '-follow_count').first()
+        urls = {
+            'posts:index': (reverse('posts:index'), None),
+            'posts:index (page 5)': (reverse('posts:index') + '?page=5',
+                                     None),
+            'posts:profile': (reverse('posts:profile',
+                                      args=[author.username]), None),
+            'posts:post': (reverse('posts:post',
+                                   args=[post.author.username, post.id]),
+                           None),
+            'posts:follow_index': (reverse('posts:follow_index'), reader),
+        }
+        if group is not None:
+            urls['posts:group_slug'] = (
+                reverse('posts:group_slug', args=[group.slug]), None)
+        return urls
+
+    @staticmethod
+    def make_client(user):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def run(self, url, user, count, concurrency):
+        def worker(requests):
+            client = self.make_client(user)
+            timings = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise CommandError(
+                        f'{url} ответил {response.status_code}')
+            return timings
+
+        start = time.perf_counter()
+        if concurrency == 1:
+            return worker(count), time.perf_counter() - start
+        shares = [count // concurrency + (i < count % concurrency)
+                  for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = [timing for chunk in pool.map(worker, shares)
+                       for timing in chunk]
+        return timings, time.perf_counter() - start
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f'revision {results["revision"]}, '
+            f'{results["requests"]} запросов на URL, '
+            f'concurrency {results["concurrency"]}')
+        self.stdout.write(f'{"url":<24}{"rps":>10}{"p50 ms":>10}'
+                          f'{"p95 ms":>10}{"p99 ms":>10}')
+        for name, row in results['urls'].items():
+            line = (f'{name:<24}{row["rps"]:>10}{row["p50_ms"]:>10}'
+                    f'{row["p95_ms"]:>10}{row["p99_ms"]:>10}')
+            old = (baseline or {}).get('urls', {}).get(name)
+            if old and old['p50_ms']:
+                change = (row['p50_ms'] - old['p50_ms']) / old['p50_ms']
+                line += f'  p50 {change:+.0%} к {baseline["revision"]}'
+            self.stdout.write(line)
@@ -0,0 +1,81 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Engine, engines
+from django.utils import timezone
+
+from posts.management.commands.benchmark import percentile
+from posts.models import Post
+from yatube.warmup import project_template_dirs, template_names
+
+User = get_user_model()
+
+POST_ITEM = 'includes/post_item.html'
+
+
+def fake_posts(count):
+    """Несохранённые посты: рендер меряется без обращений к базе."""
+    author = User(id=1, username='benchmark')
+    posts = []
+    for i in range(count):
+        post = Post(id=i + 1, author=author, text=f'Текст поста {i}',
+                    pub_date=timezone.now())
+        post.comment_count = i
+        posts.append(post)
+    return posts
+
+
+class Command(BaseCommand):
+    help = ('Время рендеринга шаблонов: прогрев всех шаблонов, ленты из '
+            '10 карточек через {% include %} и вставленных в цикл, и всей '
+            'страницы index.html.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500,
+                            help='Рендеров на каждый вариант.')
+
+    def handle(self, *args, **options):
+        backend = engines.all()[0]
+        engine = backend.engine
+        self.report_compile(engine)
+
+        posts = fake_posts(10)
+        page = Paginator(posts, 10).page(1)
+        context = {'posts': posts, 'page': page, 'paginator': page.paginator,
+                   'followed_authors': set(), 'index': True}
+        source = engine.find_template(POST_ITEM)[0].source
+        cases = {
+            'include': backend.from_string(
+                '{% for post in posts %}'
+                '{% include "' + POST_ITEM + '" with post=post %}'
+                '{% endfor %}'),
+            'inline': backend.from_string(
+                '{% for post in posts %}' + source + '{% endfor %}'),
+            'index.html': backend.get_template('index.html'),
+        }
+        for name, template in cases.items():
+            template.render(context)
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                template.render(context)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{name:<12} mean {sum(timings) / len(timings):7.3f} ms  '
+                f'p50 {percentile(timings, 50):7.3f} ms  '
+                f'p95 {percentile(timings, 95):7.3f} ms')
+
+    def report_compile(self, engine):
+        """Сколько стоит разобрать все шаблоны с нуля — это и экономит
+        прогрев воркера."""
+        cold = Engine(dirs=engine.dirs, app_dirs=True,
+                      libraries=engine.libraries, builtins=engine.builtins)
+        names = set(template_names(project_template_dirs(engine)))
+        start = time.perf_counter()
+        for name in names:
+            cold.get_template(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(f'Разбор {len(names)} шаблонов: {elapsed:.1f} ms')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import build_suggestions
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рекомендации «на кого подписаться» по графу '
+            'подписок. Запускается периодически.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=5,
+                            help='Сколько рекомендаций хранить.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        users = build_suggestions(options['top'], options['batch_size'])
+        self.stdout.write(f'Рекомендации пересчитаны для {users} '
+                          f'пользователей')
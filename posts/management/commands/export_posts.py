@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import MODELS, TransferEncoder
+
+
+class Command(BaseCommand):
+    help = ('Потоковая выгрузка пользователей, групп, постов, комментариев '
+            'и подписок в JSONL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-',
+                            help='Файл для выгрузки, по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['output'] == '-':
+            self.export(sys.stdout, options['chunk_size'])
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                self.export(file, options['chunk_size'])
+
+    def export(self, file, chunk_size):
+        encoder = TransferEncoder(ensure_ascii=False)
+        for name, (model, fields) in MODELS.items():
+            rows = model.objects.order_by('id').values(*fields).iterator(
+                chunk_size=chunk_size)
+            count = 0
+            for row in rows:
+                row['model'] = name
+                file.write(encoder.encode(row))
+                file.write('\n')
+                count += 1
+            self.stderr.write(f'{name}: {count}')
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.following import follow_many, parse_usernames, unfollow_many
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Подписывает пользователя на авторов из файла со списком имён '
+            '(через пробел, запятую или с новой строки).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Кого подписывать.')
+        parser.add_argument('input', help='Файл со списком имён.')
+        parser.add_argument('--unfollow', action='store_true',
+                            help='Отписать от авторов из списка.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден')
+        with open(options['input'], encoding='utf-8') as source:
+            usernames = parse_usernames(source.read())
+        if options['unfollow']:
+            deleted = unfollow_many(user, usernames)
+            self.stdout.write(f'Отписок: {deleted}')
+            return
+        followed, missing = follow_many(user, usernames)
+        self.stdout.write(f'Новых подписок: {followed}')
+        if missing:
+            self.stdout.write(f'Не найдены: {", ".join(missing)}')
@@ -0,0 +1,39 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.groups import import_groups
+from posts.models import Group
+
+TITLE_LENGTH = Group._meta.get_field('title').max_length
+
+
+def read_rows(path):
+    """Пары (название, описание) из CSV с колонками title и description."""
+    with open(path, encoding='utf-8', newline='') as source:
+        for line, row in enumerate(csv.DictReader(source), start=2):
+            title = (row.get('title') or '').strip()
+            if not title:
+                raise CommandError(f'Строка {line}: нужен title')
+            if len(title) > TITLE_LENGTH:
+                raise CommandError(f'Строка {line}: title длиннее '
+                                   f'{TITLE_LENGTH} символов')
+            yield title, (row.get('description') or '').strip()
+
+
+class Command(BaseCommand):
+    help = ('Создаёт группы из CSV (title, description). Слаги подбираются '
+            'в памяти без повторных попыток, группы вставляются пачками; '
+            'группы с уже существующими или повторными названиями '
+            'пропускаются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV-файл с заголовком.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Групп в одном INSERT.')
+
+    def handle(self, *args, **options):
+        created, skipped = import_groups(read_rows(options['input']),
+                                         options['batch_size'])
+        self.stdout.write(f'Создано групп: {created}, '
+                          f'пропущено: {skipped}')
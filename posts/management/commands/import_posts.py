@@ -0,0 +1,149 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
+
+from posts.partitions import reset_month_counts
+from posts.transfer import MODELS
+from posts.utils import keep_dates
+
+DATETIME_FIELDS = {'date_joined', 'last_login', 'pub_date', 'created'}
+
+
+class Command(BaseCommand):
+    help = ('Потоковая загрузка JSONL, выгруженного export_posts: пачки '
+            'bulk_create в отдельных транзакциях, продолжение с места '
+            'остановки и параллельное копирование картинок.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Файл JSONL.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--offset', type=int,
+                            help='Начать со строки с этим номером '
+                                 '(по умолчанию — из файла прогресса).')
+        parser.add_argument('--state-file',
+                            help='Файл прогресса, по умолчанию '
+                                 '<input>.offset.')
+        parser.add_argument('--media-source',
+                            help='MEDIA_ROOT исходного сайта, откуда '
+                                 'копировать картинки постов.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Потоков для копирования картинок.')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.media_source = options['media_source']
+        self.state_file = (options['state_file']
+                           or options['input'] + '.offset')
+        offset = options['offset']
+        if offset is None:
+            offset = self.read_offset()
+        self.buffers = {name: [] for name in MODELS}
+        self.buffered = 0
+        self.images = []
+        self.failed = []
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            self.pool = pool
+            with open(options['input'], encoding='utf-8') as file:
+                line_number = loaded = 0
+                for line_number, line in enumerate(file, start=1):
+                    if line_number <= offset or not line.strip():
+                        continue
+                    self.add(json.loads(line), line_number)
+                    loaded += 1
+                    if self.buffered >= self.batch_size:
+                        self.flush(line_number)
+                self.flush(line_number)
+        # bulk_create не шлёт сигналов
+        reset_month_counts()
+        self.collect_images(wait=True)
+        for image in self.failed:
+            self.stderr.write(f'Не удалось скопировать {image}')
+        self.stdout.write(
+            f'Импорт завершён, загружено строк: {loaded}, '
+            f'начиная со строки {offset + 1}')
+
+    def read_offset(self):
+        if not os.path.exists(self.state_file):
+            return 0
+        with open(self.state_file) as file:
+            return int(file.read().strip() or 0)
+
+    def write_offset(self, offset):
+        with open(self.state_file, 'w') as file:
+            file.write(str(offset))
+
+    def add(self, row, line_number):
+        name = row.pop('model', None)
+        if name not in MODELS:
+            raise CommandError(
+                f'Строка {line_number}: неизвестная модель {name!r}')
+        model, fields = MODELS[name]
+        values = {field: row.get(field) for field in fields}
+        for field in DATETIME_FIELDS.intersection(values):
+            if values[field]:
+                values[field] = parse_datetime(values[field])
+        self.buffers[name].append(model(**values))
+        self.buffered += 1
+        if name == 'post' and values['image'] and self.media_source:
+            self.images.append((values['image'], self.pool.submit(
+                self.copy_image, values['image'])))
+
+    def flush(self, offset):
+        # Строки в файле идут в порядке зависимостей, поэтому и
+        # сбрасывать буферы достаточно в том же порядке. Потоки пула только
+        # копируют картинки и моделей не сохраняют, так что keep_dates
+        # им не мешает
+        with transaction.atomic(), keep_dates():
+            for name, (model, fields) in MODELS.items():
+                batch = self.buffers[name]
+                if batch:
+                    self.insert(name, model, fields, batch)
+                    batch.clear()
+        self.buffered = 0
+        self.write_offset(offset)
+        self.collect_images()
+
+    def insert(self, name, model, fields, batch):
+        """Вставляет пачку, пропуская строки, которые уже загружены.
+
+        Так повторный прогон пачки после сбоя ничего не дублирует. Строка
+        с тем же id, но другими данными — чужая запись, а не результат
+        прошлого прогона: импорт останавливается, а не затирает её.
+        """
+        existing = {row['id']: row for row in model.objects.filter(
+            id__in=[obj.id for obj in batch]).values(*fields)}
+        new = []
+        for obj in batch:
+            row = existing.get(obj.id)
+            if row is None:
+                new.append(obj)
+            elif row != {field: getattr(obj, field) for field in fields}:
+                raise CommandError(
+                    f'{name} с id={obj.id} уже есть в базе с другими '
+                    f'данными')
+        try:
+            model.objects.bulk_create(new)
+        except IntegrityError as error:
+            raise CommandError(f'{name}: {error}')
+
+    def collect_images(self, wait=False):
+        pending = []
+        for image, future in self.images:
+            if not wait and not future.done():
+                pending.append((image, future))
+            elif future.exception() is not None:
+                self.failed.append(image)
+        self.images = pending
+
+    def copy_image(self, name):
+        if default_storage.exists(name):
+            return
+        with open(os.path.join(self.media_source, name), 'rb') as source:
+            default_storage.save(name, File(source))
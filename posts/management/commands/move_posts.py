@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.models import Group, Post
+from posts.moderation import move_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит посты группы (или автора) в другую группу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from-group', help='slug исходной группы.')
+        parser.add_argument('--author', help='Только посты этого автора.')
+        parser.add_argument('--to-group',
+                            help='slug новой группы; без него посты '
+                                 'убираются из групп.')
+
+    def handle(self, *args, **options):
+        if not options['from_group'] and not options['author']:
+            raise CommandError('Укажите --from-group или --author')
+        posts = Post.objects.all()
+        if options['from_group']:
+            posts = posts.filter(group__slug=options['from_group'])
+        if options['author']:
+            posts = posts.filter(author__username=options['author'])
+        group = None
+        if options['to_group']:
+            group = Group.objects.filter(slug=options['to_group']).first()
+            if group is None:
+                raise CommandError(
+                    f'Группа {options["to_group"]} не найдена')
+        self.stdout.write(f'Перенесено постов: {move_posts(posts, group)}')
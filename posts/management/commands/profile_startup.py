@@ -0,0 +1,98 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME = 'import time:'
+
+
+def parse_import_times(stderr):
+    """Строки -X importtime -> [(модуль, своё время, с вложенными), ...]
+    в секундах."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORT_TIME):
+            continue
+        own, cumulative, name = line[len(IMPORT_TIME):].split('|')
+        if not own.strip().isdigit():
+            # Строка заголовка
+            continue
+        rows.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return rows
+
+
+def package_times(rows):
+    """Своё время импорта, сложенное по пакетам верхнего уровня."""
+    totals = {}
+    for name, own, _ in rows:
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0) + own
+    return totals
+
+
+class Command(BaseCommand):
+    help = ('Холодный старт процесса в отдельном интерпретаторе: время '
+            'импорта по пакетам и модулям, ready() приложений и шаги до '
+            'первого ответа, как в yatube/wsgi.py.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/',
+                            help='Адрес первого запроса.')
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Запусков; шаги берутся по медиане.')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Сколько пакетов и модулей показать.')
+
+    def handle(self, *args, **options):
+        runs = [self.run(options['url']) for _ in range(options['runs'])]
+
+        self.stdout.write('Шаги до первого ответа, медиана:')
+        for name in runs[0]['phases']:
+            self.write_time(name, [run['phases'][name] for run in runs])
+        self.write_time('всего', [run['total'] for run in runs])
+        self.write_time('процесс', [run['wall'] for run in runs])
+        self.stdout.write(f'Статус первого ответа: {runs[0]["status"]}')
+
+        self.stdout.write('\nready() приложений:')
+        for label in sorted(runs[0]['ready'],
+                            key=runs[0]['ready'].get, reverse=True):
+            self.write_time(label, [run['ready'][label] for run in runs])
+
+        rows = runs[-1]['imports']
+        self.stdout.write(f'\nИмпорт по пакетам, всего '
+                          f'{sum(own for _, own, _ in rows) * 1000:.1f} ms:')
+        packages = package_times(rows)
+        for package in sorted(packages, key=packages.get,
+                              reverse=True)[:options['top']]:
+            self.stdout.write(
+                f'  {package:<30} {packages[package] * 1000:8.1f} ms')
+
+        self.stdout.write('\nСамые долгие модули (своё / с вложенными):')
+        rows.sort(key=lambda row: row[1], reverse=True)
+        for name, own, cumulative in rows[:options['top']]:
+            self.stdout.write(f'  {name:<40} {own * 1000:8.1f} ms '
+                              f'{cumulative * 1000:8.1f} ms')
+
+    def write_time(self, name, values):
+        self.stdout.write(
+            f'  {name:<30} {statistics.median(values) * 1000:8.1f} ms')
+
+    def run(self, url):
+        command = [sys.executable, '-X', 'importtime', '-m',
+                   'yatube.startup', url]
+        start = time.perf_counter()
+        process = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=os.environ.copy(),
+            capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if process.returncode:
+            raise CommandError(process.stderr.strip().splitlines()[-1])
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        result['wall'] = wall
+        result['imports'] = parse_import_times(process.stderr)
+        return result
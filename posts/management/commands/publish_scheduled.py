@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.publishing import publish_scheduled
+
+
+class Command(BaseCommand):
+    help = ('Публикует запланированные посты, время которых пришло. '
+            'Страхует задачи очереди; запускается периодически (cron).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Постов в одной транзакции.')
+
+    def handle(self, *args, **options):
+        published = publish_scheduled(batch_size=options['batch_size'])
+        self.stdout.write(f'Опубликовано постов: {published}')
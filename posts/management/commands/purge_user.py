@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.moderation import delete_comments, purge_content
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Удаляет все посты и комментарии пользователей (или только '
+            'комментарии с --comments-only).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='+')
+        parser.add_argument('--comments-only', action='store_true',
+                            help='Удалить только комментарии.')
+
+    def handle(self, *args, **options):
+        authors = User.objects.filter(username__in=options['usernames'])
+        found = set(authors.values_list('username', flat=True))
+        missing = set(options['usernames']) - found
+        if missing:
+            raise CommandError(
+                f'Не найдены пользователи: {", ".join(sorted(missing))}')
+        if options['comments_only']:
+            deleted = delete_comments(authors)
+        else:
+            deleted = purge_content(authors)
+        self.stdout.write(f'Удалено записей: {deleted}')
@@ -0,0 +1,181 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Group, Post
+from posts.partitions import reset_month_counts
+from posts.utils import keep_dates
+
+User = get_user_model()
+
+WORDS = (
+    'яндекс практикум пост лента автор друзья подписка новости утро вечер '
+    'город море горы книга фильм музыка код django python сегодня завтра '
+    'вчера отличный странный новый старый важный смешной погода кофе чай'
+).split()
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу воспроизводимыми тестовыми данными: '
+            'пользователи, группы, посты, комментарии и подписки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=30000)
+        parser.add_argument('--follows', type=int, default=20000)
+        parser.add_argument('--days', type=int, default=365,
+                            help='За сколько дней распределить даты.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.period = timedelta(days=options['days'])
+
+        user_ids = self.create_users(options['users'])
+        group_ids = self.create_groups(options['groups'])
+        # Популярность авторов распределена по закону Ципфа:
+        # несколько «звёзд» и длинный хвост почти неактивных
+        popularity = self.zipf_weights(len(user_ids))
+        post_ids = self.create_posts(options['posts'], user_ids,
+                                     popularity, group_ids)
+        self.create_comments(options['comments'], post_ids, user_ids)
+        self.create_follows(options['follows'], user_ids, popularity)
+        # bulk_create не шлёт сигналов
+        reset_month_counts()
+
+    @staticmethod
+    def zipf_weights(size, exponent=1.1):
+        return list(accumulate(1 / rank ** exponent
+                               for rank in range(1, size + 1)))
+
+    def random_date(self):
+        # Свежих записей больше, чем старых
+        age = self.period * self.random.betavariate(1, 3)
+        return self.now - age
+
+    def random_text(self, low, high):
+        return ' '.join(self.random.choices(WORDS,
+                                            k=self.random.randint(low, high)))
+
+    @staticmethod
+    def last_id(model):
+        return model.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0
+
+    @staticmethod
+    def ids_after(model, last_id):
+        return list(model.objects.filter(id__gt=last_id).order_by(
+            'id').values_list('id', flat=True))
+
+    def bulk_insert(self, model, objects, total):
+        batch = []
+        created = 0
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                created += self.flush(model, batch, total, created)
+        if batch:
+            created += self.flush(model, batch, total, created)
+
+    def flush(self, model, batch, total, created):
+        size = len(batch)
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        batch.clear()
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {created + size}/{total}')
+        return size
+
+    def create_users(self, count):
+        # Хэшируем пароль один раз: PBKDF2 на каждого — это минуты
+        password = make_password('password')
+        start = User.objects.count()
+        users = (
+            User(username=f'seed_user_{start + i}',
+                 email=f'seed_user_{start + i}@example.com',
+                 password=password)
+            for i in range(count)
+        )
+        last_id = self.last_id(User)
+        self.bulk_insert(User, users, count)
+        return self.ids_after(User, last_id)
+
+    def create_groups(self, count):
+        start = Group.objects.count()
+        groups = (
+            Group(title=f'Сообщество {start + i}',
+                  slug=f'seed-group-{start + i}',
+                  description=self.random_text(5, 20))
+            for i in range(count)
+        )
+        last_id = self.last_id(Group)
+        self.bulk_insert(Group, groups, count)
+        return self.ids_after(Group, last_id)
+
+    def create_posts(self, count, user_ids, popularity, group_ids):
+        def posts():
+            for _ in range(count):
+                author_id, = self.random.choices(user_ids,
+                                                 cum_weights=popularity)
+                group_id = None
+                if group_ids and self.random.random() < 0.5:
+                    group_id = self.random.choice(group_ids)
+                yield Post(author_id=author_id, group_id=group_id,
+                           text=self.random_text(5, 80),
+                           pub_date=self.random_date())
+
+        last_id = self.last_id(Post)
+        with keep_dates():
+            self.bulk_insert(Post, posts(), count)
+        return self.ids_after(Post, last_id)
+
+    def create_comments(self, count, post_ids, user_ids):
+        if not post_ids:
+            return
+        # Обсуждения тоже неравномерны: большая часть комментариев
+        # приходится на небольшую долю постов
+        weights = self.zipf_weights(len(post_ids), exponent=0.8)
+        shuffled = post_ids[:]
+        self.random.shuffle(shuffled)
+
+        def comments():
+            for _ in range(count):
+                post_id, = self.random.choices(shuffled, cum_weights=weights)
+                yield Comment(post_id=post_id,
+                              author_id=self.random.choice(user_ids),
+                              text=self.random_text(1, 30),
+                              created=self.random_date())
+
+        with keep_dates():
+            self.bulk_insert(Comment, comments(), count)
+
+    def create_follows(self, count, user_ids, popularity):
+        if len(user_ids) < 2:
+            return
+        # Подписки только между новыми пользователями, поэтому повторы
+        # достаточно отсекать в памяти
+        count = min(count, len(user_ids) * (len(user_ids) - 1))
+        pairs = set()
+
+        def follows():
+            while len(pairs) < count:
+                user_id = self.random.choice(user_ids)
+                author_id, = self.random.choices(user_ids,
+                                                 cum_weights=popularity)
+                if user_id == author_id or (user_id, author_id) in pairs:
+                    continue
+                pairs.add((user_id, author_id))
+                yield Follow(user_id=user_id, author_id=author_id)
+
+        self.bulk_insert(Follow, follows(), count)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.models import Digest
+from posts.notifications import send_digests
+
+
+class Command(BaseCommand):
+    help = ('Рассылает подписчикам дайджест новых записей авторов. '
+            'Запускается по расписанию (cron) с нужной периодичностью.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period', default=settings.DIGEST_PERIOD,
+            choices=[period for period, _ in Digest.PERIOD_CHOICES])
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.DIGEST_BATCH_SIZE,
+                            help='Получателей в одной пачке.')
+
+    def handle(self, *args, **options):
+        sent = send_digests(options['period'],
+                            chunk_size=options['batch_size'])
+        self.stdout.write(f'Отправлено писем: {sent}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import update_trending
+
+
+class Command(BaseCommand):
+    help = ('Добавляет в рейтинг «Популярное» новые посты и комментарии. '
+            'Запускается периодически (cron или очередь задач).')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            updated = update_trending()
+            if not updated:
+                break
+            total += updated
+        self.stdout.write(f'Обновлено постов в рейтинге: {total}')
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.28 on 2026-10-19 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_follow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Digest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hourly', 'Раз в час'), ('daily', 'Раз в день')], max_length=10, unique=True)),
+                ('sent_until', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_comment_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trendingpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,25 +1,76 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.db import models
-from pytils.translit import slugify
+from django.db.models import Count
+from django.utils import timezone
+
+from .slugs import SLUG_LENGTH, free_slug, slug_prefix, slugify_title
 
 User = get_user_model()
 
 
 class Group(models.Model):
     title = models.CharField('Название группы', max_length=200)
-    slug = models.SlugField('URL', unique=True, max_length=100)
+    slug = models.SlugField('URL', unique=True, max_length=SLUG_LENGTH)
     description = models.TextField('Описание группы')
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.title)[:100]
+            base = slugify_title(self.title)
+            taken = Group.objects.filter(
+                slug__startswith=slug_prefix(base)).values_list(
+                'slug', flat=True)
+            self.slug = free_slug(base, set(taken))
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
 
 
+def month_start(moment):
+    """Начало месяца moment по UTC."""
+    return timezone.localtime(moment, timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start):
+    return month_start(start + timedelta(days=32))
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        """Только опубликованные посты: фильтр идёт по индексу
+        posts_post_status_idx, а не проверкой каждой строки."""
+        return self.filter(status=Post.PUBLISHED)
+
+    def for_feed(self):
+        """Всё, что нужно карточке поста, без запросов на каждый пост."""
+        return self.select_related('author', 'group').annotate(
+            comment_count=Count('comments'))
+
+    def in_month(self, start, open_ended=False):
+        """Посты «раздела» — месяца, начинающегося в start (UTC).
+
+        Фильтр по диапазону pub_date читает только этот участок индекса.
+        open_ended — раздел текущего месяца, без верхней границы.
+        """
+        posts = self.filter(pub_date__gte=start)
+        if not open_ended:
+            posts = posts.filter(pub_date__lt=next_month(start))
+        return posts
+
+
 class Post(models.Model):
+    DRAFT = 'draft'
+    SCHEDULED = 'scheduled'
+    PUBLISHED = 'published'
+    STATUS_CHOICES = (
+        (DRAFT, 'Черновик'),
+        (SCHEDULED, 'Запланирован'),
+        (PUBLISHED, 'Опубликован'),
+    )
+
     text = models.TextField(verbose_name='Введите или отредактируйте пост',
                             help_text='Напишите пост')
     pub_date = models.DateTimeField("date published", auto_now_add=True)
@@ -31,12 +82,41 @@ class Post(models.Model):
                               help_text='Выберите группу для поста')
     image = models.ImageField(upload_to='posts/', blank=True, null=True,
                               verbose_name='Рисунок')
+    status = models.CharField('Статус', max_length=10,
+                              choices=STATUS_CHOICES, default=PUBLISHED)
+    publish_at = models.DateTimeField('Опубликовать в', blank=True,
+                                      null=True)
+
+    objects = PostQuerySet.as_manager()
+
+    is_archived = False
+    # Группа на момент загрузки из базы: при переносе поста сигнал
+    # сбрасывает счётчики и старой, и новой группы
+    loaded_group_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        post.loaded_group_id = post.__dict__.get('group_id')
+        return post
+
+    @property
+    def is_published(self):
+        return self.status == self.PUBLISHED
 
     def __str__(self):
         return self.text
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['pub_date', 'id'],
+                         name='posts_post_pub_date_idx'),
+            models.Index(fields=['status', 'pub_date'],
+                         name='posts_post_status_idx'),
+            models.Index(fields=['status', 'publish_at'],
+                         name='posts_post_schedule_idx'),
+        ]
 
 
 class Comment(models.Model):
@@ -46,7 +126,7 @@ class Comment(models.Model):
                                related_name='comments')
     text = models.TextField(verbose_name='Комментарий',
                             help_text='Оставьте комментарий')
-    created = models.DateTimeField(auto_now_add=True)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return self.text
@@ -57,3 +137,98 @@ class Follow(models.Model):
                              related_name='follower')
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                related_name='following')
+
+    class Meta:
+        unique_together = ('user', 'author')
+
+
+class Digest(models.Model):
+    """До какого момента отправлены дайджесты новых записей."""
+    HOURLY = 'hourly'
+    DAILY = 'daily'
+    PERIOD_CHOICES = (
+        (HOURLY, 'Раз в час'),
+        (DAILY, 'Раз в день'),
+    )
+
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES,
+                              unique=True)
+    sent_until = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.period}: {self.sent_until}'
+
+
+class TrendingPost(models.Model):
+    """Рейтинг поста в ленте «Популярное», см. posts.trending."""
+    post = models.OneToOneField(Post, on_delete=models.CASCADE,
+                                primary_key=True, related_name='trending')
+    score = models.FloatField()
+    # Обновляется вместе с рейтингом, чтобы лента не считала комментарии
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['-score'],
+                                name='posts_trending_score_idx')]
+
+
+class TrendingState(models.Model):
+    """До каких постов и комментариев рейтинг уже пересчитан."""
+    last_post_id = models.PositiveIntegerField(default=0)
+    last_comment_id = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+
+class FollowSuggestion(models.Model):
+    """Рекомендация «на кого подписаться», см. posts.recommendations."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='follow_suggestions')
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE,
+                                  related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['rank']
+        unique_together = ('user', 'rank')
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из Post, см. posts.archive.
+
+    id сохраняется прежним, поэтому ссылки на пост продолжают работать.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='archived_posts')
+    group = models.ForeignKey(Group, on_delete=models.SET_NULL, blank=True,
+                              null=True, related_name='archived_posts')
+    image = models.ImageField(upload_to='posts/', blank=True, null=True)
+    archived = models.DateTimeField(auto_now_add=True)
+
+    objects = PostQuerySet.as_manager()
+
+    is_archived = True
+    is_published = True
+
+    def __str__(self):
+        return self.text
+
+    class Meta:
+        ordering = ['-pub_date']
+
+
+class ArchivedComment(models.Model):
+    """Комментарий к архивному посту."""
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE,
+                             related_name='comments')
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='archived_comments')
+    text = models.TextField()
+    created = models.DateTimeField()
+
+    def __str__(self):
+        return self.text
@@ -0,0 +1,86 @@
+"""Массовая модерация одним UPDATE или DELETE на таблицу.
+
+Построчное удаление через ORM посылает сигналы и удаляет каскадом по
+одному объекту. Здесь изменения делаются запросами над множеством строк,
+а зависящие от них кэши сбрасываются один раз после. Файлы картинок и
+их миниатюры удаляет задача posts.delete_images.
+"""
+from django.db import transaction
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from jobs.queue import enqueue
+
+from .cache import (invalidate_feed_counts, invalidate_follow_counts,
+                    invalidate_group_directory)
+from .models import (ArchivedComment, ArchivedPost, Comment, Post,
+                     TrendingPost)
+from .partitions import invalidate_month_counts
+
+
+def invalidate_posts(group_ids, first_pub_date, authors=None):
+    invalidate_group_directory()
+    invalidate_feed_counts('group', group_ids)
+    invalidate_month_counts(first_pub_date)
+    if authors is not None:
+        # Лента подписок читателей этих авторов стала короче
+        invalidate_follow_counts(authors)
+
+
+def move_posts(posts, group):
+    """Переносит посты в группу group (None — убрать из групп)."""
+    posts = posts.order_by()
+    with transaction.atomic():
+        group_ids = set(posts.values_list('group_id', flat=True).distinct())
+        first = posts.aggregate(first=Min('pub_date'))['first']
+        moved = Post.objects.filter(
+            id__in=posts.values('id')).update(group=group)
+    invalidate_posts(group_ids | {getattr(group, 'id', None)}, first)
+    return moved
+
+
+def delete_comments(authors):
+    """Удаляет все комментарии пользователей authors."""
+    remaining = Comment.objects.filter(post_id=OuterRef('post_id')).exclude(
+        author__in=authors).order_by().values('post_id').annotate(
+        count=Count('id')).values('count')
+    with transaction.atomic():
+        # Число комментариев в «Популярном» у постов, где они были
+        TrendingPost.objects.filter(post_id__in=Comment.objects.filter(
+            author__in=authors).values('post_id')).update(
+            comment_count=Coalesce(Subquery(remaining), 0))
+        deleted = Comment.objects.filter(author__in=authors).delete()[0]
+        deleted += ArchivedComment.objects.filter(
+            author__in=authors).delete()[0]
+    return deleted
+
+
+def purge_content(authors):
+    """Удаляет посты и комментарии пользователей authors вместе с
+    картинками. Учётные записи, подписки и комментарии других
+    пользователей к удаляемым постам остаются."""
+    posts = Post.objects.filter(author__in=authors).order_by()
+    with transaction.atomic():
+        group_ids = set(posts.values_list('group_id', flat=True).distinct())
+        first = posts.aggregate(first=Min('pub_date'))['first']
+        images = list(posts.exclude(image='').exclude(
+            image__isnull=True).values_list('image', flat=True))
+        images += ArchivedPost.objects.filter(author__in=authors).exclude(
+            image='').exclude(image__isnull=True).values_list(
+            'image', flat=True)
+        deleted = delete_comments(authors)
+        # Чужие комментарии остаются без поста, как при обычном удалении
+        # (SET_NULL); рейтинг удаляемых постов не нужен
+        Comment.objects.filter(post__in=posts).update(post=None)
+        TrendingPost.objects.filter(post__in=posts).delete()
+        archived = ArchivedPost.objects.filter(author__in=authors).order_by()
+        deleted += ArchivedComment.objects.filter(
+            post__in=archived).delete()[0]
+        # QuerySet.delete() выбирал бы посты в память ради каскадов и
+        # обработчиков post_delete; зависимые строки уже удалены выше
+        deleted += archived._raw_delete(archived.db)
+        deleted += posts._raw_delete(posts.db)
+    invalidate_posts(group_ids, first, authors)
+    if images:
+        enqueue('posts.delete_images', {'names': images})
+    return deleted
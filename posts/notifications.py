@@ -0,0 +1,95 @@
+"""Дайджесты новых записей для подписчиков.
+
+Получатели обрабатываются пачками по id, на пачку приходится три запроса:
+id подписчиков, пары «подписчик — пост» и сами пользователи. Память
+зависит от размера пачки и числа новых постов за период, но не от числа
+подписчиков у автора.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Digest, Follow, Post
+
+User = get_user_model()
+
+PERIODS = {
+    Digest.HOURLY: timedelta(hours=1),
+    Digest.DAILY: timedelta(days=1),
+}
+
+
+def recipient_chunks(author_ids, chunk_size):
+    """id подписчиков авторов author_ids пачками, по возрастанию."""
+    last_id = 0
+    while True:
+        chunk = list(Follow.objects.filter(
+            author_id__in=author_ids, user_id__gt=last_id).order_by(
+            'user_id').values_list('user_id', flat=True).distinct()[
+            :chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def build_digests(since, until, chunk_size):
+    """Пачки пар (пользователь, новые посты его авторов) за период."""
+    posts = {
+        post.id: post for post in Post.objects.published().filter(
+            pub_date__gte=since, pub_date__lt=until).select_related(
+            'author').order_by('-pub_date')
+    }
+    if not posts:
+        return
+    window = Post.objects.published().filter(
+        pub_date__gte=since, pub_date__lt=until).order_by()
+    author_ids = window.values('author_id')
+    for chunk in recipient_chunks(author_ids, chunk_size):
+        post_ids = {}
+        pairs = window.filter(
+            author__following__user_id__in=chunk).values_list(
+            'author__following__user_id', 'id')
+        for user_id, post_id in pairs:
+            post_ids.setdefault(user_id, []).append(post_id)
+        users = User.objects.filter(id__in=chunk, is_active=True).exclude(
+            email='')
+        batch = []
+        for user in users:
+            user_posts = [posts[post_id]
+                          for post_id in post_ids.get(user.id, ())]
+            user_posts.sort(key=lambda post: post.pub_date, reverse=True)
+            batch.append((user, user_posts))
+        yield batch
+
+
+def make_message(user, posts):
+    context = {'user': user, 'posts': posts,
+               'site_url': settings.SITE_URL}
+    subject = render_to_string('emails/digest_subject.txt', context).strip()
+    body = render_to_string('emails/digest.txt', context)
+    return EmailMessage(subject, body, to=[user.email])
+
+
+def send_digests(period, now=None, chunk_size=None):
+    """Отправляет дайджест за время с прошлой отправки, возвращает число
+    писем."""
+    now = now or timezone.now()
+    chunk_size = chunk_size or settings.DIGEST_BATCH_SIZE
+    digest = Digest.objects.filter(period=period).first()
+    since = digest.sent_until if digest else now - PERIODS[period]
+    sent = 0
+    # Одно SMTP-соединение на весь прогон
+    with get_connection() as connection:
+        for batch in build_digests(since, now, chunk_size):
+            messages = [make_message(user, posts) for user, posts in batch]
+            for message in messages:
+                message.connection = connection
+            sent += connection.send_messages(messages) or 0
+    Digest.objects.update_or_create(period=period,
+                                    defaults={'sent_until': now})
+    return sent
@@ -0,0 +1,112 @@
+"""Глобальная лента по месячным разделам.
+
+Таблица posts_post не делится физически: раздел — это диапазон pub_date
+длиной в месяц (Post.objects.in_month), который читается по индексу
+posts_post_pub_date_idx. Число постов в каждом месяце известно заранее,
+поэтому срез ленты [start:stop] превращается в запросы к одному-двум
+разделам с небольшим смещением внутри месяца, а не в OFFSET по всей
+таблице. Первые страницы читают только текущий и прошлый месяцы.
+
+Курсоры по (pub_date, id) здесь не используются: лента обязана
+оставаться обычным Paginator с номерами страниц, и смещение просто
+считается по числам постов в месяцах. Поэтому эти числа должны быть
+точными: сигналы Post сбрасывают кэш при одиночных изменениях, а всё,
+что пишет посты пачками (bulk_create, update(), _raw_delete), вызывает
+invalidate_month_counts или reset_month_counts само.
+
+Сброс доходит только до того кэша, в котором лежат числа. С LocMemCache
+по умолчанию у каждого процесса своя копия: после удаления, архивации или
+чистки старого поста другие воркеры до FEED_MONTH_COUNTS_TIMEOUT считают
+смещения по старым числам, и на границах страниц пост пропускается или
+повторяется. Точной лента остаётся только с кэшем, общим для всех
+процессов (см. CACHES в настройках).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import Post, month_start
+
+
+def month_counts_key(current):
+    return f'posts:month_counts:{current:%Y%m}'
+
+
+def month_counts():
+    """[(начало месяца, число постов)] от новых месяцев к старым.
+
+    Закрытые месяцы почти не меняются и кэшируются до конца текущего
+    месяца; текущий считается каждый раз запросом по индексу.
+    """
+    current = month_start(timezone.now())
+    key = month_counts_key(current)
+    closed = cache.get(key)
+    if closed is None:
+        closed = list(Post.objects.published().filter(
+            pub_date__lt=current).annotate(
+            month=TruncMonth('pub_date', tzinfo=timezone.utc)).values(
+            'month').annotate(count=Count('id')).order_by(
+            '-month').values_list('month', 'count'))
+        cache.set(key, closed, settings.FEED_MONTH_COUNTS_TIMEOUT)
+    fresh = Post.objects.published().in_month(current, True).count()
+    return [(current, fresh)] + closed
+
+
+def invalidate_month_counts(pub_date):
+    """Сбрасывает кэш, если изменился пост закрытого месяца (или пост
+    опубликован задним числом)."""
+    current = month_start(timezone.now())
+    if pub_date is not None and pub_date < current:
+        cache.delete(month_counts_key(current))
+
+
+def reset_month_counts():
+    """Сбрасывает кэш после массовой записи постов с любыми датами."""
+    cache.delete(month_counts_key(month_start(timezone.now())))
+
+
+class MonthlyFeed:
+    """Все посты от новых к старым как последовательность для Paginator."""
+
+    def __init__(self, posts=None):
+        if posts is None:
+            posts = Post.objects.published().for_feed()
+        self.posts = posts
+
+    @cached_property
+    def months(self):
+        return month_counts()
+
+    @cached_property
+    def total(self):
+        return sum(count for month, count in self.months)
+
+    def count(self):
+        return self.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            items = self[index:index + 1]
+            if not items:
+                raise IndexError(index)
+            return items[0]
+        start = index.start or 0
+        stop = self.total if index.stop is None else index.stop
+        items = []
+        offset = 0
+        for number, (month, count) in enumerate(self.months):
+            if offset >= stop:
+                break
+            if offset + count > start:
+                # Первый раздел — текущий месяц, он открыт в будущее
+                part = self.posts.in_month(month, number == 0).order_by(
+                    '-pub_date', '-id')
+                items += part[max(start - offset, 0):stop - offset]
+            offset += count
+        return items
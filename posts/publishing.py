@@ -0,0 +1,79 @@
+"""Черновики и отложенная публикация постов.
+
+Запланированный пост ставит в очередь задачу posts.publish_scheduled на
+свою минуту; задача (и команда publish_scheduled для cron) публикует
+все созревшие посты пачками. Ленты видят только опубликованные посты
+через Post.objects.published().
+
+Датой поста становится момент, когда он действительно вышел, но не
+раньше publish_at: пост, опубликованный с опозданием, всё равно попадёт
+в ближайший дайджест, окно которого считается по pub_date.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import DateTimeField, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+from .cache import invalidate_feed_counts, invalidate_group_directory
+from .models import Post
+from .partitions import invalidate_month_counts
+from .trending import score_published
+
+
+def apply_status(post, draft=False, publish_at=None):
+    """Выставляет посту статус по выбору автора (не сохраняет).
+
+    Возвращает True, если сохранённый раньше пост сейчас выходит в ленту.
+    """
+    was_published = post.pk is not None and post.is_published
+    if draft:
+        post.status, post.publish_at = Post.DRAFT, None
+    elif publish_at is not None:
+        post.status, post.publish_at = Post.SCHEDULED, publish_at
+    else:
+        post.status, post.publish_at = Post.PUBLISHED, None
+        if post.pk is not None and not was_published:
+            # Черновик выходит в ленту с датой публикации, а не создания
+            post.pub_date = timezone.now()
+            return True
+    return False
+
+
+def schedule_publishing(post):
+    """Ставит публикацию запланированного поста в очередь задач."""
+    if post.status != Post.SCHEDULED:
+        return
+    # Одна задача на минуту: она опубликует все посты, что созрели к ней
+    enqueue('posts.publish_scheduled',
+            key=f'publish:{post.publish_at:%Y%m%d%H%M}',
+            delay=max(post.publish_at - timezone.now(), timedelta()))
+
+
+def publish_scheduled(now=None, batch_size=500):
+    """Публикует посты, чьё время пришло, возвращает их число."""
+    now = now or timezone.now()
+    total = 0
+    while True:
+        published = timezone.now()
+        with transaction.atomic():
+            due = list(Post.objects.filter(
+                status=Post.SCHEDULED, publish_at__lte=now).order_by(
+                'publish_at', 'id').values_list(
+                'id', 'publish_at', 'group_id')[:batch_size])
+            if not due:
+                return total
+            ids = [post_id for post_id, _, _ in due]
+            Post.objects.filter(id__in=ids, status=Post.SCHEDULED).update(
+                status=Post.PUBLISHED,
+                pub_date=Greatest(F('publish_at'), Value(
+                    published, output_field=DateTimeField())))
+        # update() не посылает сигналов, кэши и рейтинг обновляем сами
+        invalidate_group_directory()
+        invalidate_feed_counts('group', {row[2] for row in due})
+        invalidate_month_counts(min(due[0][1], published))
+        score_published(ids)
+        total += len(due)
@@ -0,0 +1,89 @@
+"""Ограничение частоты запросов к пишущим представлениям.
+
+Скользящее окно приближается двумя соседними фиксированными окнами:
+счётчик прошлого окна учитывается с весом той его доли, что ещё попадает
+в скользящее окно. Счётчики живут в общем кэше и меняются только
+атомарными cache.add и cache.incr, к базе данных ничего не обращается.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+def retry_after(limit, period, elapsed, previous, current):
+    """Сколько секунд ждать, пока оценка опустится ниже лимита."""
+    if current < limit and previous:
+        # Ждём, пока вклад прошлого окна затухнет достаточно
+        wait = period * (1 - (limit - current) / previous) - elapsed
+    else:
+        # Текущее окно должно стать прошлым и частично затухнуть
+        wait = period - elapsed + period * (1 - limit / max(current, 1))
+    return max(1, math.ceil(wait))
+
+
+def hit(key, limit, period, now=None):
+    """Засчитывает запрос. Возвращает None или сколько секунд ждать."""
+    now = time.time() if now is None else now
+    window = int(now // period)
+    elapsed = now - window * period
+    current_key = f'ratelimit:{key}:{period}:{window}'
+    previous_key = f'ratelimit:{key}:{period}:{window - 1}'
+    cache.add(current_key, 0, timeout=period * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Ключ вытеснен между add и incr
+        cache.add(current_key, 1, timeout=period * 2)
+        current = 1
+    previous = cache.get(previous_key, 0)
+    estimate = previous * (1 - elapsed / period) + current
+    if estimate <= limit:
+        return None
+    return retry_after(limit, period, elapsed, previous, current)
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Ограничивает представление лимитами RATELIMITS[scope].
+
+    Лимиты задаются отдельно на пользователя и на IP-адрес. methods=None —
+    считать запросы любым методом.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limits = settings.RATELIMITS.get(scope, {})
+            if (settings.RATELIMIT_ENABLED
+                    and (methods is None or request.method in methods)):
+                keys = {'ip': client_ip(request)}
+                if request.user.is_authenticated:
+                    keys['user'] = request.user.pk
+                for kind, value in keys.items():
+                    if kind not in limits:
+                        continue
+                    limit, period = parse_rate(limits[kind])
+                    wait = hit(f'{scope}:{kind}:{value}', limit, period)
+                    if wait is not None:
+                        response = HttpResponse(
+                            'Слишком много запросов, попробуйте позже.',
+                            status=429)
+                        response['Retry-After'] = str(wait)
+                        return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
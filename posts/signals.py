@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import (invalidate_feed_counts, invalidate_following,
+                    invalidate_group_directory)
+from .models import Follow, Group, Post
+from .partitions import invalidate_month_counts
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_directory_changed(sender, **kwargs):
+    invalidate_group_directory()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def month_counts_changed(sender, instance, **kwargs):
+    invalidate_month_counts(instance.pub_date)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def following_changed(sender, instance, **kwargs):
+    invalidate_following(instance.user_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def group_count_changed(sender, instance, **kwargs):
+    invalidate_feed_counts('group',
+                           {instance.group_id, instance.loaded_group_id})
+    instance.loaded_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_count_changed(sender, instance, **kwargs):
+    invalidate_feed_counts('follow', [instance.user_id])
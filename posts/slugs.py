@@ -0,0 +1,31 @@
+"""Слаги групп из названий.
+
+Занятые слаги с тем же началом читаются одним запросом, и свободный
+суффикс выбирается в памяти, а не попытками сохранить группу до первого
+IntegrityError. Одновременное создание двух групп с одинаковым названием
+по-прежнему упрётся в уникальный индекс.
+"""
+SLUG_LENGTH = 100
+# Место под суффикс «-N»: на столько короче префикс поиска занятых слагов
+SUFFIX_LENGTH = 8
+
+
+def slugify_title(title):
+    # pytils нужен только здесь, воркеры без него стартуют быстрее
+    from pytils.translit import slugify
+    return slugify(title)[:SLUG_LENGTH] or 'group'
+
+
+def slug_prefix(base):
+    """Начало, общее для base и всех его вариантов с суффиксом."""
+    return base[:SLUG_LENGTH - SUFFIX_LENGTH]
+
+
+def free_slug(base, taken):
+    """Первый свободный из base, base-2, base-3… не длиннее SLUG_LENGTH."""
+    slug, number = base, 1
+    while slug in taken:
+        number += 1
+        suffix = f'-{number}'
+        slug = base[:SLUG_LENGTH - len(suffix)] + suffix
+    return slug
@@ -0,0 +1,37 @@
+"""Потоковая отдача длинных страниц.
+
+Страница рендерится целиком, но вместо списка в ней стоит метка
+STREAM_MARKER. Всё до метки уходит клиенту сразу, затем элементы списка
+читаются из базы курсором через iterator(chunk_size) и отдаются пачками,
+в конце — остаток страницы. Память не зависит от длины списка.
+"""
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+
+# Совпадает с меткой в includes/comments.html
+STREAM_MARKER = '<!--stream:comments-->'
+
+
+def stream_items(head, items, item_template, tail, chunk_size):
+    template = get_template(item_template)
+    yield head
+    chunk = []
+    for item in items.iterator(chunk_size=chunk_size):
+        chunk.append(template.render({'item': item}))
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+    yield tail
+
+
+def stream_render(request, template_name, context, items, item_template,
+                  chunk_size=100):
+    """StreamingHttpResponse: страница template_name, в которой на месте
+    STREAM_MARKER выводятся items через item_template."""
+    page = render_to_string(template_name, dict(context, streaming=True),
+                            request)
+    head, tail = page.split(STREAM_MARKER, 1)
+    return StreamingHttpResponse(
+        stream_items(head, items, item_template, tail, chunk_size))
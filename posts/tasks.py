@@ -0,0 +1,54 @@
+from sorl.thumbnail import delete, get_thumbnail
+
+from jobs.queue import task
+
+from .archive import archive_posts
+from .models import Post
+from .notifications import send_digests
+from .publishing import publish_scheduled
+from .recommendations import build_suggestions
+from .trending import update_trending
+
+# Должно совпадать с параметрами {% thumbnail %} в includes/post_item.html
+THUMBNAIL_GEOMETRY = '960x339'
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+@task('posts.generate_thumbnail')
+def generate_thumbnail(post_id):
+    """Заранее готовит миниатюру, чтобы первый показ ленты её не ждал."""
+    post = Post.objects.filter(id=post_id).first()
+    if post is not None and post.image:
+        get_thumbnail(post.image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
+
+
+@task('posts.send_digests')
+def send_digests_task(period):
+    send_digests(period)
+
+
+@task('posts.update_trending')
+def update_trending_task():
+    update_trending()
+
+
+@task('posts.build_follow_suggestions')
+def build_follow_suggestions_task(top_n=5):
+    build_suggestions(top_n)
+
+
+@task('posts.archive_posts')
+def archive_posts_task():
+    archive_posts()
+
+
+@task('posts.publish_scheduled')
+def publish_scheduled_task():
+    publish_scheduled()
+
+
+@task('posts.delete_images')
+def delete_images(names):
+    """Удаляет картинки удалённых постов вместе с миниатюрами."""
+    for name in names:
+        delete(name)
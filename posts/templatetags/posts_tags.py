@@ -0,0 +1,28 @@
+from django import template
+
+from posts.cache import group_directory
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/group_sidebar.html')
+def group_sidebar(current=None):
+    return {'groups': group_directory(),
+            'current_slug': getattr(current, 'slug', None)}
+
+
+@register.simple_tag
+def page_window(page, radius=2):
+    """Номера страниц вокруг текущей, первая и последняя; None — пропуск.
+
+    Для 50 страниц и текущей 20: 1, None, 18, ..., 22, None, 50.
+    """
+    last = page.paginator.num_pages
+    low = max(page.number - radius, 1)
+    high = min(page.number + radius, last)
+    numbers = list(range(low, high + 1))
+    if low > 1:
+        numbers = [1] + ([None] if low > 2 else []) + numbers
+    if high < last:
+        numbers += ([None] if high < last - 1 else []) + [last]
+    return numbers
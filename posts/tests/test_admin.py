@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.admin import LargeTableAdmin
+from posts.models import Comment, Follow, Group, Post
+from posts.tests.utils import QueryBudgetMixin
+
+User = get_user_model()
+
+# Страница короче обычной: рендеринг сотни строк — самая долгая часть
+# теста, а рост запросов видно и на двадцати
+PER_PAGE = 20
+SIZES = (10, 30, 60)
+
+
+class AdminChangelistTests(QueryBudgetMixin, TestCase):
+    """Списки админки не делают запросов на каждую строку.
+
+    Число строк берётся из кэша; остаются сессия, пользователь, выборка
+    страницы и, для date_hierarchy, границы и дни по индексу дат.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(LargeTableAdmin, 'list_per_page',
+                                    PER_PAGE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def fill(self, size):
+        # У каждой строки свои автор, группа и пост
+        start = User.objects.count()
+        User.objects.bulk_create(
+            User(username=f'user_{i}') for i in range(start, start + size))
+        authors = list(User.objects.filter(username__startswith='user_')
+                       .order_by('-id')[:size])
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}')
+            for i in range(start, start + size))
+        groups = list(Group.objects.order_by('-id')[:size])
+        Post.objects.bulk_create(
+            Post(author=author, group=group, text='Длинный текст ' * 50)
+            for author, group in zip(authors, groups))
+        posts = list(Post.objects.order_by('-id')[:size])
+        Comment.objects.bulk_create(
+            Comment(post=post, author=author, text='Коммент ' * 50)
+            for post, author in zip(posts, authors))
+        Follow.objects.bulk_create(
+            Follow(user=self.admin, author=author) for author in authors)
+        # Новые строки должны попасть в список сразу
+        cache.clear()
+
+    def test_post_changelist(self):
+        self.assertConstantQueries(
+            self.admin_client, reverse('admin:posts_post_changelist'),
+            self.fill, SIZES, max_queries=5, warm_up=True)
+
+    def test_comment_changelist(self):
+        self.assertConstantQueries(
+            self.admin_client, reverse('admin:posts_comment_changelist'),
+            self.fill, SIZES, max_queries=5, warm_up=True)
+
+    def test_follow_changelist(self):
+        self.assertConstantQueries(
+            self.admin_client, reverse('admin:posts_follow_changelist'),
+            self.fill, SIZES, max_queries=3, warm_up=True)
+
+    def test_text_is_truncated(self):
+        self.fill(1)
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'))
+        self.assertNotContains(response, 'Длинный текст ' * 50)
+        self.assertContains(response, 'Длинный текст Длинный')
+
+    def test_count_is_cached(self):
+        self.fill(10)
+        url = reverse('admin:posts_post_changelist')
+        self.admin_client.get(url)
+        Post.objects.all().delete()
+        response = self.admin_client.get(url)
+        self.assertEqual(response.context['cl'].result_count, 10)
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import ArchiveChain, archive_posts
+from posts.models import (ArchivedComment, ArchivedPost, Comment, Follow,
+                          Post)
+from posts.utils import keep_dates
+
+User = get_user_model()
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.author = User.objects.create(username='test_author')
+        old = timezone.now() - timedelta(days=400)
+        with keep_dates():
+            Post.objects.bulk_create(
+                Post(author=cls.author, text=f'Старый {i}',
+                     pub_date=old + timedelta(minutes=i))
+                for i in range(12))
+        cls.old_post = Post.objects.order_by('id').first()
+        Comment.objects.create(post=cls.old_post, author=cls.user,
+                               text='Старый коммент')
+        cls.new_post = Post.objects.create(author=cls.author, text='Свежий')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_old_posts_move_with_comments(self):
+        self.assertEqual(archive_posts(batch_size=5), 12)
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        self.assertEqual(ArchivedPost.objects.count(), 12)
+        self.assertFalse(Comment.objects.exists())
+        comment = ArchivedComment.objects.get()
+        self.assertEqual(comment.post_id, self.old_post.id)
+        self.assertEqual(archive_posts(), 0)
+
+    def test_archived_post_is_reachable(self):
+        archive_posts()
+        response = self.guest_client.get(reverse(
+            'posts:post', kwargs={'username': self.author.username,
+                                  'post_id': self.old_post.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['post'].text, self.old_post.text)
+        self.assertEqual(response.context['post'].comment_count, 1)
+        self.assertContains(response, 'Старый коммент')
+
+    def test_profile_continues_into_archive(self):
+        archive_posts()
+        url = reverse('posts:profile',
+                      kwargs={'username': self.author.username})
+        response = self.guest_client.get(url)
+        page = response.context['page']
+        self.assertEqual(response.context['paginator'].count, 13)
+        self.assertEqual(page[0], self.new_post)
+        self.assertTrue(page[1].is_archived)
+        response = self.guest_client.get(url, {'page': 2})
+        self.assertEqual(len(response.context['page']), 3)
+
+    def test_chain_slices_across_tables(self):
+        archive_posts()
+        chain = ArchiveChain(self.author.posts.all(),
+                             self.author.archived_posts.all())
+        texts = [post.text for post in chain[0:3]]
+        self.assertEqual(texts, ['Свежий', 'Старый 11', 'Старый 10'])
+        self.assertEqual(chain[12].text, 'Старый 0')
+        self.assertEqual(len(chain), 13)
+
+    def test_follow_feed_count_is_refreshed(self):
+        Follow.objects.create(user=self.user, author=self.author)
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('posts:follow_index')
+        self.assertEqual(client.get(url).context['paginator'].count, 13)
+        archive_posts()
+        self.assertEqual(client.get(url).context['paginator'].count, 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_posts', '--days', '30', stdout=out)
+        self.assertIn('12', out.getvalue())
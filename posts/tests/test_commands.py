@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase
+
+from posts.management.commands import profile_startup
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class SeedDataCommandTests(TestCase):
+    def seed(self, seed):
+        call_command('seed_data', users=20, groups=3, posts=100, comments=50,
+                     follows=40, seed=seed, batch_size=30, stdout=StringIO())
+
+    def test_seed_data_creates_requested_rows(self):
+        self.seed(seed=1)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 100)
+        self.assertEqual(Comment.objects.count(), 50)
+        self.assertEqual(Follow.objects.count(), 40)
+        self.assertFalse(Follow.objects.filter(
+            user_id=F('author_id')).exists())
+
+    def test_seed_data_is_reproducible(self):
+        self.seed(seed=7)
+        first = list(Post.objects.order_by('id').values_list(
+            'author__username', 'text'))
+        Post.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        self.seed(seed=7)
+        second = list(Post.objects.order_by('id').values_list(
+            'author__username', 'text'))
+        self.assertEqual(
+            [text for _, text in first], [text for _, text in second])
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_benchmark_reports_percentiles(self):
+        call_command('seed_data', users=5, groups=1, posts=15, comments=5,
+                     follows=5, stdout=StringIO())
+        # Самый новый пост — черновик, гостю он отдаёт 404
+        Post.objects.create(author=User.objects.first(), text='Черновик',
+                            status=Post.DRAFT)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = os.path.join(directory.name, 'bench.json')
+        call_command('benchmark', requests=3, warmup=1, output=output,
+                     stdout=StringIO())
+        with open(output) as file:
+            results = json.load(file)
+        self.assertIn('posts:index', results['urls'])
+        for row in results['urls'].values():
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+
+
+class TransferCommandsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'dump.jsonl')
+        call_command('seed_data', users=10, groups=2, posts=30, comments=20,
+                     follows=15, stdout=StringIO())
+        self.posts = list(Post.objects.order_by('id').values_list(
+            'id', 'text', 'pub_date', 'author__username', 'group__slug'))
+        call_command('export_posts', self.path, stderr=StringIO())
+
+    def clear(self):
+        Comment.objects.all().delete()
+        Post.objects.all().delete()
+        Group.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_export_then_import_restores_data(self):
+        self.clear()
+        call_command('import_posts', self.path, batch_size=7,
+                     stdout=StringIO())
+        self.assertEqual(list(Post.objects.order_by('id').values_list(
+            'id', 'text', 'pub_date', 'author__username', 'group__slug')),
+            self.posts)
+        self.assertEqual(Comment.objects.count(), 20)
+        self.assertEqual(Follow.objects.count(), 15)
+        with open(self.path + '.offset') as file:
+            self.assertEqual(int(file.read()), 10 + 2 + 30 + 20 + 15)
+
+    def test_repeated_batch_is_skipped(self):
+        # Сбой между фиксацией пачки и записью прогресса
+        self.clear()
+        call_command('import_posts', self.path, stdout=StringIO())
+        call_command('import_posts', self.path, offset=0, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 20)
+
+    def test_import_refuses_to_overwrite_other_rows(self):
+        author_id, username = Post.objects.values_list(
+            'author_id', 'author__username').first()
+        self.clear()
+        User.objects.create(id=author_id, username='someone_else')
+        with self.assertRaisesMessage(CommandError, f'id={author_id}'):
+            call_command('import_posts', self.path, stdout=StringIO())
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(User.objects.filter(username=username).exists())
+
+    def test_import_resumes_from_saved_offset(self):
+        """После сбоя импорт продолжается с последней сохранённой пачки."""
+        state_file = self.path + '.state'
+        partial = self.path + '.partial'
+        with open(self.path) as source, open(partial, 'w') as target:
+            target.writelines(source.readlines()[:25])
+        self.clear()
+        call_command('import_posts', partial, batch_size=10,
+                     state_file=state_file, stdout=StringIO())
+        out = StringIO()
+        call_command('import_posts', self.path, batch_size=10,
+                     state_file=state_file, stdout=out)
+        self.assertIn('загружено строк: 52, начиная со строки 26',
+                      out.getvalue())
+        self.assertEqual(list(Post.objects.order_by('id').values_list(
+            'id', 'text', 'pub_date', 'author__username', 'group__slug')),
+            self.posts)
+
+
+class ProfileStartupTests(SimpleTestCase):
+    def test_parse_import_times(self):
+        rows = profile_startup.parse_import_times(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       150 |        150 |   django.utils\n'
+            'import time:       250 |        400 | django\n'
+            'Прочий вывод\n')
+        self.assertEqual(rows, [('django.utils', 0.00015, 0.00015),
+                                ('django', 0.00025, 0.0004)])
+        self.assertAlmostEqual(
+            profile_startup.package_times(rows)['django'], 0.0004)
+
+    def test_worker_starts_without_optional_packages(self):
+        # Дочерний процесс получает тестовые настройки с базой в памяти
+        with mock.patch.dict(os.environ,
+                             DJANGO_SETTINGS_MODULE='yatube.settings_test'):
+            result = profile_startup.Command().run('/about/author/')
+        self.assertEqual(result['status'], '200 OK')
+        self.assertIn('django.setup', result['phases'])
+        packages = profile_startup.package_times(result['imports'])
+        self.assertIn('django', packages)
+        self.assertNotIn('pytils', packages)
+        self.assertNotIn('debug_toolbar', packages)
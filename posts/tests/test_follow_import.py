@@ -0,0 +1,86 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import following_ids
+from posts.following import follow_many, parse_usernames
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+
+class FollowImportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        User.objects.bulk_create(
+            User(username=f'author_{i}') for i in range(5))
+        cls.authors = list(User.objects.filter(username__startswith='author'))
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_parse_usernames(self):
+        self.assertEqual(parse_usernames('@a, b\nc  a;b'), ['a', 'b', 'c'])
+
+    def test_follow_many_in_constant_queries(self):
+        Follow.objects.create(user=self.user, author=self.authors[0])
+        usernames = [author.username for author in self.authors]
+        with self.assertNumQueries(3):
+            followed, missing = follow_many(
+                self.user, usernames + ['ghost', self.user.username])
+        self.assertEqual(followed, 4)
+        self.assertEqual(missing, ['ghost'])
+        self.assertEqual(self.user.follower.count(), 5)
+
+    def test_following_cache_is_refreshed(self):
+        self.assertEqual(following_ids(self.user), set())
+        follow_many(self.user, [self.authors[0].username])
+        self.assertEqual(following_ids(self.user), {self.authors[0].id})
+
+    def test_follow_feed_count_is_refreshed(self):
+        Post.objects.bulk_create(
+            Post(author=self.authors[0], text=str(i)) for i in range(25))
+        url = reverse('posts:follow_index')
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.context['paginator'].count, 0)
+        follow_many(self.user, [self.authors[0].username])
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.context['paginator'].count, 25)
+        self.assertEqual(len(response.context['page']), 10)
+
+    def test_endpoint_follows_and_unfollows(self):
+        url = reverse('posts:follow_import')
+        response = self.authorized_client.post(
+            url, {'usernames': 'author_0 author_1 ghost'})
+        self.assertEqual(response.context['result'],
+                         {'followed': 2, 'missing': ['ghost']})
+        response = self.authorized_client.post(
+            url, {'usernames': 'author_0', 'unfollow': 'on'})
+        self.assertEqual(response.context['result'], {'unfollowed': 1})
+        self.assertEqual(
+            list(self.user.follower.values_list('author__username',
+                                                flat=True)),
+            ['author_1'])
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt',
+                                         delete=False) as source:
+            source.write('author_2\nauthor_3\n')
+        self.addCleanup(os.remove, source.name)
+        out = StringIO()
+        call_command('import_follows', self.user.username, source.name,
+                     stdout=out)
+        self.assertIn('Новых подписок: 2', out.getvalue())
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import following_ids
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+
+class FollowingStatusTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.other = User.objects.create(username='other_user')
+        cls.author = User.objects.create(username='test_author')
+        Post.objects.create(author=cls.author, text='Тестовый текст')
+        Follow.objects.create(user=cls.other, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.profile_url = reverse(
+            'posts:profile', kwargs={'username': self.author.username})
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_other_followers_do_not_count(self):
+        response = self.authorized_client.get(self.profile_url)
+        self.assertFalse(response.context['following'])
+        self.assertNotContains(response, 'Вы подписаны')
+
+    def test_following_status_follows_subscription(self):
+        self.authorized_client.get(reverse(
+            'posts:profile_follow', args=[self.author.username]))
+        response = self.authorized_client.get(self.profile_url)
+        self.assertTrue(response.context['following'])
+        self.assertContains(response, 'Вы подписаны')
+        self.authorized_client.get(reverse(
+            'posts:profile_unfollow', args=[self.author.username]))
+        response = self.authorized_client.get(self.profile_url)
+        self.assertFalse(response.context['following'])
+
+    def test_following_set_is_cached(self):
+        with self.assertNumQueries(1):
+            following_ids(self.other)
+        with self.assertNumQueries(0):
+            self.assertEqual(following_ids(self.other), {self.author.id})
+
+    def test_follow_is_unique(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Follow.objects.create(user=self.other, author=self.author)
@@ -1,7 +1,3 @@
-import shutil
-import tempfile
-
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase
@@ -17,7 +13,6 @@ class PostCreateFormTests(TestCase):
     def setUpClass(cls):
         super().setUpClass()
         # Создаем запись в базе данных
-        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
         cls.small_gif = (
             b'\x47\x49\x46\x38\x39\x61\x02\x00'
             b'\x01\x00\x80\x00\x00\x00\x00\x00'
@@ -49,11 +44,6 @@ class PostCreateFormTests(TestCase):
         # Авторизуем пользователя
         self.authorized_client.force_login(self.user)
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def test_create_post(self):
         """Валидная форма создает запись в Post."""
         # Подсчитаем количество записей в Post
@@ -0,0 +1,120 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import group_directory
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.group = Group.objects.create(
+            title='Test',
+            description='Много букв'
+        )
+        cls.empty_group = Group.objects.create(
+            title='Empty',
+            description='Пусто'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, group=cls.group, text=str(i))
+            for i in range(3))
+
+    def setUp(self):
+        self.guest_client = Client()
+        cache.clear()
+
+    def test_directory_counts_posts_in_one_query(self):
+        with self.assertNumQueries(1):
+            groups = group_directory()
+        counts = {group['slug']: group['post_count'] for group in groups}
+        self.assertEqual(counts, {self.group.slug: 3,
+                                  self.empty_group.slug: 0})
+        with self.assertNumQueries(0):
+            group_directory()
+
+    def test_directory_is_invalidated_on_changes(self):
+        group_directory()
+        Post.objects.create(author=self.user, group=self.empty_group,
+                            text='Новый пост')
+        counts = {group['slug']: group['post_count']
+                  for group in group_directory()}
+        self.assertEqual(counts[self.empty_group.slug], 1)
+
+        self.empty_group.title = 'Renamed'
+        self.empty_group.save()
+        titles = [group['title'] for group in group_directory()]
+        self.assertIn('Renamed', titles)
+
+    def test_group_list_page(self):
+        response = self.guest_client.get(reverse('posts:group_list'))
+        self.assertTemplateUsed(response, 'groups.html')
+        self.assertContains(response, 'Записей: 3')
+
+    def test_group_page_has_sidebar(self):
+        response = self.guest_client.get(
+            reverse('posts:group_slug', kwargs={'slug': self.group.slug}))
+        self.assertTemplateUsed(response, 'includes/group_sidebar.html')
+        self.assertContains(response, reverse('posts:group_list'))
+
+
+class GroupSlugTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_similar_titles_get_next_free_suffix(self):
+        Group.objects.create(title='Котики', description='1')
+        Group.objects.create(title='Котики!', description='2')
+        # Выборка занятых слагов и вставка, без повторов
+        with self.assertNumQueries(2):
+            group = Group.objects.create(title='Котики?', description='3')
+        self.assertEqual(group.slug, 'kotiki-3')
+        self.assertEqual(
+            list(Group.objects.order_by('id').values_list('slug', flat=True)),
+            ['kotiki', 'kotiki-2', 'kotiki-3'])
+
+    def test_suffix_fits_max_length(self):
+        first = Group.objects.create(title='Ж' * 100, description='1')
+        second = Group.objects.create(title='Ж' * 120, description='2')
+        self.assertEqual(first.slug, 'zh' * 50)
+        self.assertEqual(len(second.slug), 100)
+        self.assertTrue(second.slug.endswith('-2'))
+
+    def test_import_groups_command(self):
+        Group.objects.create(title='Котики', description='Было')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'groups.csv')
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write('title,description\n')
+            target.write('Котики,Дубль\n')
+            for i in range(50):
+                target.write(f'Котики {i % 5}!,Описание {i}\n')
+                target.write(f'Котики?{i},Описание {i}\n')
+        group_directory()
+        out = StringIO()
+        # Все слаги и названия одним запросом, вставка одним INSERT
+        # между SAVEPOINT и RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            call_command('import_groups', path, stdout=out)
+        # Пропущены существующая группа и 45 повторов из файла
+        self.assertIn('Создано групп: 55, пропущено: 46',
+                      out.getvalue())
+        slugs = list(Group.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), len(set(slugs)))
+        self.assertIn('kotiki-2', slugs)
+        self.assertEqual(len(group_directory()), 56)
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+from yatube.metrics import registry
+
+User = get_user_model()
+
+
+class MetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        Post.objects.create(author=cls.user, text='Тестовый текст')
+
+    def setUp(self):
+        self.guest_client = Client()
+        registry.clear()
+
+    def test_request_is_recorded_by_url_name(self):
+        """Запрос к главной попадает в гистограммы по имени URL."""
+        response = self.guest_client.get(reverse('posts:index'))
+        requests = registry.get('request_duration_seconds', 'posts:index')
+        self.assertEqual(requests.count, 1)
+        self.assertGreater(registry.get('db_queries', 'posts:index').sum, 0)
+        self.assertGreater(
+            registry.get('template_duration_seconds', 'posts:index').sum, 0)
+        self.assertEqual(
+            registry.get('response_size_bytes', 'posts:index').sum,
+            len(response.content))
+
+    def test_metrics_endpoint_exports_prometheus_format(self):
+        self.guest_client.get(reverse('posts:index'))
+        response = self.guest_client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response,
+            'yatube_request_duration_seconds_count{view="posts:index"} 1')
+        self.assertContains(response, 'le="+Inf"')
+
+    def test_metrics_endpoint_hidden_from_external_ips(self):
+        response = self.guest_client.get(reverse('metrics'),
+                                         REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 404)
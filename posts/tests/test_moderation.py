@@ -0,0 +1,178 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jobs.models import Job
+from posts.archive import archive_posts
+from posts.cache import group_directory
+from posts.models import (ArchivedPost, Comment, Follow, Group, Post,
+                          TrendingPost)
+from posts.moderation import move_posts, purge_content
+from posts.trending import update_trending
+
+User = get_user_model()
+
+
+class ModerationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+        cls.spammer = User.objects.create(username='spammer')
+        cls.user = User.objects.create(username='test_user')
+        cls.group = Group.objects.create(title='Старая', slug='old',
+                                         description='Много букв')
+        cls.new_group = Group.objects.create(title='Новая', slug='new',
+                                             description='Много букв')
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def add_posts(self, count, author=None, **fields):
+        Post.objects.bulk_create(
+            Post(author=author or self.spammer, group=self.group,
+                 text=str(i), **fields)
+            for i in range(count))
+
+    def count_queries(self, func, *args):
+        with CaptureQueriesContext(connection) as queries:
+            func(*args)
+        return len(queries)
+
+    def test_move_posts_is_set_based(self):
+        self.add_posts(3)
+        self.assertEqual(group_directory()[0]['post_count'], 0)
+        few = self.count_queries(
+            move_posts, Post.objects.filter(group=self.new_group),
+            self.group)
+        self.add_posts(30)
+        many = self.count_queries(
+            move_posts, Post.objects.filter(group=self.group),
+            self.new_group)
+        self.assertEqual(few, many)
+        self.assertEqual(self.new_group.posts.count(), 33)
+        # Кэш каталога групп сброшен
+        self.assertEqual(group_directory()[0]['post_count'], 33)
+
+    def test_move_to_group_action(self):
+        self.add_posts(3)
+        ids = list(Post.objects.values_list('id', flat=True)[:2])
+        self.admin_client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'move_to_group', '_selected_action': ids,
+            'group': self.new_group.slug})
+        self.assertEqual(set(self.new_group.posts.values_list(
+            'id', flat=True)), set(ids))
+
+    def test_move_to_group_requires_slug(self):
+        self.add_posts(2)
+        ids = list(Post.objects.values_list('id', flat=True))
+        response = self.admin_client.post(
+            reverse('admin:posts_post_changelist'),
+            {'action': 'move_to_group', '_selected_action': ids,
+             'group': ''}, follow=True)
+        self.assertContains(response, 'Укажите slug группы')
+        self.assertEqual(self.group.posts.count(), 2)
+
+        self.admin_client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'remove_from_group', '_selected_action': ids})
+        self.assertFalse(Post.objects.filter(group__isnull=False).exists())
+
+    def test_purge_removes_all_content(self):
+        self.add_posts(3, image='posts/spam.jpg')
+        old_post = Post.objects.create(author=self.spammer, text='Старый')
+        Post.objects.filter(id=old_post.id).update(pub_date='2000-01-01')
+        archive_posts()
+        post = Post.objects.filter(author=self.spammer).first()
+        Comment.objects.create(post=post, author=self.user, text='Ответ')
+        Comment.objects.create(post=None, author=self.spammer, text='Спам')
+        update_trending()
+        Post.objects.create(author=self.user, text='Честный пост')
+
+        purge_content(User.objects.filter(id=self.spammer.id))
+
+        self.assertFalse(Post.objects.filter(author=self.spammer).exists())
+        self.assertFalse(ArchivedPost.objects.exists())
+        answer = Comment.objects.get()
+        self.assertEqual((answer.text, answer.post), ('Ответ', None))
+        self.assertEqual(TrendingPost.objects.count(), 0)
+        self.assertTrue(Post.objects.filter(author=self.user).exists())
+        job = Job.objects.get(name='posts.delete_images')
+        self.assertIn('posts/spam.jpg', job.payload)
+
+    def test_purge_action_asks_for_confirmation(self):
+        self.add_posts(3)
+        Comment.objects.create(post=Post.objects.first(),
+                               author=self.spammer, text='Спам')
+        ids = list(Post.objects.values_list('id', flat=True)[:1])
+        url = reverse('admin:posts_post_changelist')
+        data = {'action': 'purge_authors', '_selected_action': ids}
+        response = self.admin_client.post(url, data)
+        self.assertTemplateUsed(response,
+                                'admin/posts/confirm_authors_action.html')
+        self.assertContains(response, 'spammer: постов — 3, '
+                                      'комментариев — 1')
+        self.assertEqual(Post.objects.count(), 3)
+
+        self.admin_client.post(url, {**data, 'post': 'yes'})
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+
+    def test_delete_comments_recounts_trending(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        Comment.objects.bulk_create(
+            Comment(post=post, author=self.spammer, text=str(i))
+            for i in range(3))
+        Comment.objects.create(post=post, author=self.user, text='Свой')
+        update_trending()
+        self.assertEqual(post.trending.comment_count, 4)
+        url = reverse('admin:posts_comment_changelist')
+        data = {'action': 'delete_authors_comments', '_selected_action': [
+            Comment.objects.filter(author=self.spammer).first().id]}
+        response = self.admin_client.post(url, data)
+        self.assertContains(response, 'spammer: комментариев — 3')
+        self.admin_client.post(url, {**data, 'post': 'yes'})
+        self.assertEqual(TrendingPost.objects.get(post=post).comment_count, 1)
+
+    def test_purge_resets_followers_feed_count(self):
+        Follow.objects.create(user=self.user, author=self.spammer)
+        self.add_posts(15)
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('posts:follow_index')
+        self.assertEqual(
+            client.get(url).context['paginator'].count, 15)
+        purge_content(User.objects.filter(id=self.spammer.id))
+        self.assertEqual(client.get(url).context['paginator'].count, 0)
+
+    def test_purge_query_count_does_not_depend_on_size(self):
+        spammers = User.objects.filter(id=self.spammer.id)
+        self.add_posts(2)
+        few = self.count_queries(purge_content, spammers)
+        self.add_posts(50)
+        many = self.count_queries(purge_content, spammers)
+        self.assertEqual(few, many)
+
+    def test_delete_comments_command(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        Comment.objects.bulk_create(
+            Comment(post=post, author=self.spammer, text=str(i))
+            for i in range(5))
+        Comment.objects.create(post=post, author=self.user, text='Свой')
+        out = StringIO()
+        call_command('purge_user', 'spammer', '--comments-only', stdout=out)
+        self.assertIn('5', out.getvalue())
+        self.assertEqual(list(post.comments.values_list('text', flat=True)),
+                         ['Свой'])
+        self.assertTrue(Post.objects.filter(author=self.user).exists())
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from posts.models import Digest, Follow, Post
+from posts.notifications import send_digests
+
+User = get_user_model()
+
+
+class DigestTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='test_author')
+        cls.another_author = User.objects.create(username='another_author')
+        cls.followers = [
+            User.objects.create(username=f'follower_{i}',
+                                email=f'follower_{i}@example.com')
+            for i in range(5)
+        ]
+        cls.no_email = User.objects.create(username='no_email')
+        cls.inactive = User.objects.create(
+            username='inactive', email='inactive@example.com',
+            is_active=False)
+        for user in cls.followers + [cls.no_email, cls.inactive]:
+            Follow.objects.create(user=user, author=cls.author)
+        Follow.objects.create(user=cls.followers[0],
+                              author=cls.another_author)
+        cls.post = Post.objects.create(author=cls.author,
+                                       text='Новая запись')
+        Post.objects.create(author=cls.another_author, text='Ещё запись')
+
+    def test_followers_get_one_digest_each(self):
+        sent = send_digests(Digest.DAILY, chunk_size=2)
+        self.assertEqual(sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(
+            recipients, sorted(user.email for user in self.followers))
+        first = next(message for message in mail.outbox
+                     if message.to == [self.followers[0].email])
+        self.assertIn('Новая запись', first.body)
+        self.assertIn('Ещё запись', first.body)
+
+    def test_posts_are_sent_only_once(self):
+        send_digests(Digest.DAILY)
+        mail.outbox.clear()
+        later = timezone.now() + timedelta(days=1)
+        self.assertEqual(send_digests(Digest.DAILY, now=later), 0)
+        self.assertEqual(Digest.objects.get(period=Digest.DAILY).sent_until,
+                         later)
+
+    def test_queries_do_not_depend_on_follower_count(self):
+        """На пачку получателей — постоянное число запросов."""
+        with CaptureQueriesContext(connection) as queries:
+            send_digests(Digest.HOURLY, chunk_size=100)
+        mail.outbox.clear()
+        Digest.objects.all().delete()
+        extra = [User(username=f'extra_{i}', email=f'extra_{i}@example.com')
+                 for i in range(50)]
+        User.objects.bulk_create(extra)
+        Follow.objects.bulk_create(
+            Follow(user=user, author=self.author)
+            for user in User.objects.filter(username__startswith='extra_'))
+        with self.assertNumQueries(len(queries)):
+            send_digests(Digest.HOURLY, chunk_size=100)
+        self.assertEqual(len(mail.outbox), 55)
+
+    def test_send_digests_command(self):
+        call_command('send_digests', period='hourly')
+        self.assertEqual(len(mail.outbox), 5)
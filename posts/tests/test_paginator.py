@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.templatetags.posts_tags import page_window
+
+User = get_user_model()
+
+
+class PageWindowTests(TestCase):
+    def window(self, number, pages=50):
+        page = Paginator(range(pages), 1).page(number)
+        return page_window(page)
+
+    def test_window_around_current_page(self):
+        self.assertEqual(self.window(20), [1, None, 18, 19, 20, 21, 22,
+                                           None, 50])
+
+    def test_window_at_edges(self):
+        self.assertEqual(self.window(1), [1, 2, 3, None, 50])
+        self.assertEqual(self.window(4), [1, 2, 3, 4, 5, 6, None, 50])
+        self.assertEqual(self.window(50), [1, None, 48, 49, 50])
+        self.assertEqual(self.window(2, pages=3), [1, 2, 3])
+
+
+class FeedCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='test_author')
+        cls.group = Group.objects.create(title='Test', slug='test',
+                                         description='Много букв')
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=str(i))
+            for i in range(300))
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse('posts:group_slug', args=[self.group.slug])
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_links_are_bounded(self):
+        response = self.guest_client.get(self.url, {'page': 15})
+        # Назад, 1, 13, 14, 16, 17, 30, вперёд; 15 — без ссылки
+        self.assertEqual(response.content.decode().count('?page='), 8)
+
+    def test_count_is_cached_and_invalidated(self):
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['paginator'].count, 300)
+        # update() не посылает сигналов: число берётся из кэша
+        Post.objects.filter(text='0').update(group=None)
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['paginator'].count, 300)
+        Post.objects.get(text='1').delete()
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['paginator'].count, 298)
+
+    def test_moved_post_resets_both_groups(self):
+        other = Group.objects.create(title='Other', slug='other',
+                                     description='Много букв')
+        other_url = reverse('posts:group_slug', args=[other.slug])
+        self.guest_client.get(self.url)
+        self.guest_client.get(other_url)
+        post = Post.objects.get(text='2')
+        post.group = other
+        post.save()
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['paginator'].count, 299)
+        response = self.guest_client.get(other_url)
+        self.assertEqual(response.context['paginator'].count, 1)
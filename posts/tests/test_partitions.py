@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post, month_start
+from posts.partitions import MonthlyFeed, month_counts
+from posts.utils import keep_dates
+
+User = get_user_model()
+
+
+class MonthlyFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='test_author')
+        current = month_start(timezone.now())
+        # 3 поста в текущем месяце, 12 в прошлом, 7 три месяца назад
+        dates = (
+            [current + timedelta(minutes=i) for i in range(3)]
+            + [current - timedelta(days=10, minutes=i) for i in range(12)]
+            + [current - timedelta(days=70, minutes=i) for i in range(7)]
+        )
+        with keep_dates():
+            Post.objects.bulk_create(
+                Post(author=cls.author, text=str(i), pub_date=date)
+                for i, date in enumerate(dates))
+        cls.expected = list(Post.objects.order_by('-pub_date', '-id'))
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def tearDown(self):
+        # Кэш не откатывается вместе с транзакцией теста
+        cache.clear()
+
+    def test_month_counts(self):
+        self.assertEqual([count for month, count in month_counts()],
+                         [3, 12, 7])
+
+    def test_slices_match_plain_ordering(self):
+        feed = MonthlyFeed()
+        self.assertEqual(len(feed), 22)
+        for start, stop in ((0, 10), (10, 20), (20, 30), (2, 16), (0, 22)):
+            self.assertEqual(feed[start:stop], self.expected[start:stop])
+        self.assertEqual(feed[14], self.expected[14])
+
+    def test_first_page_reads_recent_partitions(self):
+        feed = MonthlyFeed()
+        feed.months
+        with self.assertNumQueries(2):
+            feed[0:10]
+
+    def test_index_pages(self):
+        response = self.guest_client.get(reverse('posts:index'),
+                                         {'page': 3})
+        self.assertEqual(response.context['paginator'].count, 22)
+        self.assertEqual(list(response.context['page']), self.expected[20:])
+
+    def test_closed_month_counts_invalidated(self):
+        month_counts()
+        Post.objects.get(pk=self.expected[-1].pk).delete()
+        self.assertEqual([count for month, count in month_counts()],
+                         [3, 12, 6])
+
+    def test_bulk_import_resets_month_counts(self):
+        month_counts()
+        call_command('seed_data', users=2, groups=1, posts=30, comments=0,
+                     follows=0, days=400, stdout=StringIO())
+        self.assertEqual(sum(count for month, count in month_counts()),
+                         Post.objects.count())
@@ -0,0 +1,152 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from posts.models import Digest, Follow, Group, Post, TrendingPost
+from posts.notifications import send_digests
+from posts.publishing import publish_scheduled
+from posts.trending import trending_posts, update_trending
+from posts.utils import keep_dates
+
+User = get_user_model()
+
+
+class PublishingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='test_author')
+        cls.group = Group.objects.create(title='Test', slug='test',
+                                         description='Много букв')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def tearDown(self):
+        cache.clear()
+
+    def feed_texts(self, url):
+        response = self.guest_client.get(url)
+        return [post.text for post in response.context['page']]
+
+    def feeds(self):
+        return (reverse('posts:index'),
+                reverse('posts:group_slug', args=[self.group.slug]),
+                reverse('posts:profile', args=[self.author.username]))
+
+    def test_draft_stays_out_of_feeds(self):
+        response = self.author_client.post(
+            reverse('posts:new_post'),
+            {'text': 'Черновик', 'group': self.group.id, 'draft': 'on'})
+        self.assertRedirects(response, reverse('posts:drafts'))
+        post = Post.objects.get()
+        self.assertEqual(post.status, Post.DRAFT)
+        for url in self.feeds():
+            self.assertNotIn('Черновик', self.feed_texts(url))
+        post_url = reverse('posts:post', args=[self.author.username, post.id])
+        self.assertEqual(self.guest_client.get(post_url).status_code, 404)
+        self.assertEqual(self.author_client.get(post_url).status_code, 200)
+        response = self.author_client.get(reverse('posts:drafts'))
+        self.assertEqual(list(response.context['page']), [post])
+
+    def test_scheduled_post_is_published_by_worker(self):
+        publish_at = timezone.now() + timedelta(hours=1)
+        self.author_client.post(reverse('posts:new_post'), {
+            'text': 'Потом', 'group': self.group.id,
+            'publish_at': publish_at.strftime('%Y-%m-%d %H:%M')})
+        post = Post.objects.get()
+        self.assertEqual(post.status, Post.SCHEDULED)
+        job = Job.objects.get(name='posts.publish_scheduled')
+        self.assertEqual(job.run_at.replace(second=0, microsecond=0),
+                         post.publish_at)
+
+        self.assertEqual(publish_scheduled(), 0)
+        self.assertEqual(
+            publish_scheduled(now=timezone.now() + timedelta(hours=2)), 1)
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertEqual(post.pub_date, post.publish_at)
+
+    def test_publish_at_must_be_in_future(self):
+        response = self.author_client.post(reverse('posts:new_post'), {
+            'text': 'Вчера', 'publish_at': '2000-01-01 10:00'})
+        self.assertTrue(response.context['publish_form'].errors)
+        self.assertFalse(Post.objects.exists())
+
+    def test_publishing_draft_from_edit_page(self):
+        post = Post.objects.create(author=self.author, text='Черновик',
+                                   group=self.group, status=Post.DRAFT)
+        self.assertNotIn('Черновик', self.feed_texts(self.feeds()[1]))
+        self.author_client.post(
+            reverse('posts:post_edit', args=[self.author.username, post.id]),
+            {'text': 'Черновик', 'group': self.group.id})
+        post.refresh_from_db()
+        self.assertTrue(post.is_published)
+        for url in self.feeds():
+            self.assertIn('Черновик', self.feed_texts(url))
+
+    def schedule(self, text, publish_at):
+        with keep_dates():
+            return Post.objects.create(
+                author=self.author, text=text, status=Post.SCHEDULED,
+                publish_at=publish_at, pub_date=publish_at)
+
+    def test_scheduled_post_reaches_trending(self):
+        now = timezone.now()
+        post = self.schedule('Потом', now + timedelta(minutes=1))
+        Post.objects.create(author=self.author, text='Сразу')
+        update_trending()
+        self.assertFalse(TrendingPost.objects.filter(post=post).exists())
+
+        publish_scheduled(now=now + timedelta(minutes=2))
+        self.assertIn(post, trending_posts())
+        response = self.guest_client.get(reverse('posts:trending'))
+        self.assertIn('Потом',
+                      [item.text for item in response.context['page']])
+
+    def test_draft_published_from_edit_reaches_trending(self):
+        post = Post.objects.create(author=self.author, text='Черновик',
+                                   status=Post.DRAFT)
+        Post.objects.create(author=self.author, text='Сразу')
+        update_trending()
+        self.assertFalse(TrendingPost.objects.filter(post=post).exists())
+        self.author_client.post(
+            reverse('posts:post_edit', args=[self.author.username, post.id]),
+            {'text': 'Черновик'})
+        self.assertIn(post, trending_posts())
+
+    def test_published_date_is_stored_like_other_dates(self):
+        # Опоздавший пост получает дату публикации из Value(published)
+        post = self.schedule('Опоздал', timezone.now() - timedelta(hours=1))
+        publish_scheduled()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pub_date FROM posts_post WHERE id = %s',
+                           [post.id])
+            raw, = cursor.fetchone()
+        self.assertRegex(str(raw), r'^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(\.\d+)?$')
+        post.refresh_from_db()
+        self.assertGreater(post.pub_date, post.publish_at)
+
+    def test_late_post_gets_into_next_digest(self):
+        follower = User.objects.create(username='follower',
+                                       email='follower@example.com')
+        Follow.objects.create(user=follower, author=self.author)
+        now = timezone.now()
+        self.schedule('Опоздал', now - timedelta(hours=2))
+        # Дайджест за прошлые часы ушёл раньше, чем задача публикации
+        Digest.objects.create(period=Digest.HOURLY,
+                              sent_until=now - timedelta(minutes=1))
+        publish_scheduled()
+        send_digests(Digest.HOURLY)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Опоздал', mail.outbox[0].body)
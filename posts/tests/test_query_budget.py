@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+from posts.tests.utils import QueryBudgetMixin
+
+User = get_user_model()
+
+SIZES = (1, 5, 25)
+MAX_SECONDS = 1
+
+
+class FeedQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Ленты не делают запросов на каждый пост или комментарий."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.author = User.objects.create(username='test_author')
+        cls.group = Group.objects.create(
+            title='Test',
+            description='Много букв'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group
+        )
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def fill_posts(self, size):
+        posts = [Post(author=self.author, group=self.group, text=str(i))
+                 for i in range(self.author.posts.count(), size)]
+        Post.objects.bulk_create(posts)
+        comments = [Comment(post=post, author=self.user, text='Коммент')
+                    for post in self.author.posts.all()]
+        Comment.objects.bulk_create(comments)
+        # bulk_create не шлёт сигналов: замер идёт с пустым кэшем
+        cache.clear()
+
+    def fill_comments(self, size):
+        comments = [Comment(post=self.post, author=self.user, text=str(i))
+                    for i in range(self.post.comments.count(), size)]
+        Comment.objects.bulk_create(comments)
+        cache.clear()
+
+    def test_index_query_budget(self):
+        self.assertConstantQueries(
+            self.authorized_client, reverse('posts:index'),
+            self.fill_posts, SIZES, max_queries=6, max_seconds=MAX_SECONDS)
+
+    def test_group_posts_query_budget(self):
+        self.assertConstantQueries(
+            self.authorized_client,
+            reverse('posts:group_slug', kwargs={'slug': self.group.slug}),
+            self.fill_posts, SIZES, max_queries=4, max_seconds=MAX_SECONDS,
+            warm_up=True)
+
+    def test_profile_query_budget(self):
+        self.assertConstantQueries(
+            self.authorized_client,
+            reverse('posts:profile',
+                    kwargs={'username': self.author.username}),
+            self.fill_posts, SIZES, max_queries=10, max_seconds=MAX_SECONDS)
+
+    def test_post_view_query_budget(self):
+        self.assertConstantQueries(
+            self.authorized_client,
+            reverse('posts:post',
+                    kwargs={'username': self.author.username,
+                            'post_id': self.post.id}),
+            self.fill_comments, SIZES, max_queries=9,
+            max_seconds=MAX_SECONDS)
+
+    def test_follow_index_query_budget(self):
+        self.assertConstantQueries(
+            self.authorized_client, reverse('posts:follow_index'),
+            self.fill_posts, SIZES, max_queries=6, max_seconds=MAX_SECONDS)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.ratelimit import hit
+
+User = get_user_model()
+
+RATELIMITS = {
+    'new_post': {'user': '2/m', 'ip': '3/m'},
+    'profile_follow': {'user': '1/m'},
+}
+
+
+class SlidingWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_limit_within_window(self):
+        for _ in range(3):
+            self.assertIsNone(hit('test', 3, 60, now=600))
+        self.assertIsNotNone(hit('test', 3, 60, now=601))
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(4):
+            hit('test', 4, 60, now=630)
+        # Прошла четверть нового окна: от прошлого осталось 4 * 0.75 = 3
+        self.assertIsNone(hit('test', 4, 60, now=675))
+        self.assertIsNotNone(hit('test', 4, 60, now=675))
+        # Ближе к концу окна прошлые запросы почти не учитываются
+        self.assertIsNone(hit('test', 4, 60, now=718))
+
+    def test_no_database_queries(self):
+        with self.assertNumQueries(0):
+            hit('test', 3, 60)
+
+
+@override_settings(RATELIMITS=RATELIMITS)
+class RateLimitViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.another_user = User.objects.create(username='another_user')
+        cls.author = User.objects.create(username='test_author')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_new_post_returns_429_with_retry_after(self):
+        for i in range(2):
+            response = self.authorized_client.post(
+                reverse('posts:new_post'), data={'text': str(i)})
+            self.assertEqual(response.status_code, 302)
+        response = self.authorized_client.post(
+            reverse('posts:new_post'), data={'text': 'спам'})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertFalse(Post.objects.filter(text='спам').exists())
+
+    def test_get_form_is_not_limited(self):
+        for _ in range(5):
+            response = self.authorized_client.get(reverse('posts:new_post'))
+            self.assertEqual(response.status_code, 200)
+
+    def test_ip_limit_applies_across_users(self):
+        for i in range(2):
+            self.authorized_client.post(reverse('posts:new_post'),
+                                        data={'text': str(i)})
+        another_client = Client()
+        another_client.force_login(self.another_user)
+        response = another_client.post(reverse('posts:new_post'),
+                                       data={'text': 'ещё'})
+        self.assertEqual(response.status_code, 302)
+        response = another_client.post(reverse('posts:new_post'),
+                                       data={'text': 'спам'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_follow_is_limited_for_any_method(self):
+        url = reverse('posts:profile_follow', args=[self.author.username])
+        self.assertEqual(self.authorized_client.get(url).status_code, 302)
+        self.assertEqual(self.authorized_client.get(url).status_code, 429)
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_limits_can_be_disabled(self):
+        url = reverse('posts:profile_follow', args=[self.author.username])
+        for _ in range(3):
+            self.assertEqual(self.authorized_client.get(url).status_code,
+                             302)
@@ -0,0 +1,72 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, FollowSuggestion
+from posts.recommendations import (build_suggestions, load_graph,
+                                   suggestions_for)
+
+User = get_user_model()
+
+
+class FollowSuggestionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.friend = User.objects.create(username='friend')
+        cls.friend_of_friend = User.objects.create(username='friend_of_friend')
+        cls.peer = User.objects.create(username='peer')
+        cls.co_followed = User.objects.create(username='co_followed')
+        cls.stranger = User.objects.create(username='stranger')
+        Follow.objects.create(user=cls.user, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.friend_of_friend)
+        Follow.objects.create(user=cls.peer, author=cls.friend)
+        Follow.objects.create(user=cls.peer, author=cls.co_followed)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_friends_of_friends_and_co_follows_are_suggested(self):
+        build_suggestions(top_n=5)
+        suggested = [suggestion.suggested
+                     for suggestion in suggestions_for(self.user)]
+        self.assertEqual(suggested, [self.friend_of_friend,
+                                     self.co_followed])
+        self.assertNotIn(self.friend, suggested)
+        self.assertNotIn(self.stranger, suggested)
+
+    def test_top_n_limits_stored_suggestions(self):
+        build_suggestions(top_n=1)
+        self.assertEqual(
+            FollowSuggestion.objects.filter(user=self.user).count(), 1)
+
+    def test_followed_suggestion_is_hidden_before_rebuild(self):
+        build_suggestions()
+        Follow.objects.create(user=self.user, author=self.friend_of_friend)
+        suggested = [suggestion.suggested
+                     for suggestion in suggestions_for(self.user)]
+        self.assertEqual(suggested, [self.co_followed])
+
+    def test_suggestions_rendered_on_follow_and_profile(self):
+        call_command('build_follow_suggestions', stdout=StringIO())
+        urls = (reverse('posts:follow_index'),
+                reverse('posts:profile', args=[self.friend.username]))
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertTemplateUsed(response, 'includes/suggestions.html')
+                self.assertContains(response, '@friend_of_friend')
+
+    def test_peers_are_latest_followers(self):
+        newcomer = User.objects.create(username='newcomer')
+        Follow.objects.create(user=newcomer, author=self.friend)
+        with mock.patch('posts.recommendations.MAX_PEERS', 2):
+            _, followers, peers = load_graph()
+        self.assertEqual(len(followers[self.friend.id]), 3)
+        self.assertEqual(peers[self.friend.id], [newcomer.id, self.peer.id])
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(STREAM_COMMENTS_THRESHOLD=5, STREAM_CHUNK_SIZE=4)
+class StreamingPostViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.author = User.objects.create(username='test_author')
+        cls.post = Post.objects.create(author=cls.author,
+                                       text='Тестовый текст')
+        cls.quiet_post = Post.objects.create(author=cls.author,
+                                             text='Без обсуждения')
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.user, text=f'Коммент {i}')
+            for i in range(10))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def url(self, post):
+        return reverse('posts:post', args=[self.author.username, post.id])
+
+    def test_long_thread_is_streamed(self):
+        response = self.guest_client.get(self.url(self.post))
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        # Шапка, три пачки комментариев по 4, 4 и 2, конец страницы
+        self.assertEqual(len(chunks), 5)
+        self.assertIn('Тестовый текст', chunks[0])
+        self.assertNotIn('Коммент 0', chunks[0])
+        page = ''.join(chunks)
+        for i in range(10):
+            self.assertIn(f'Коммент {i}', page)
+        self.assertIn('</html>', chunks[-1])
+
+    def test_short_thread_is_rendered_at_once(self):
+        response = self.guest_client.get(self.url(self.quiet_post))
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.context['post'], self.quiet_post)
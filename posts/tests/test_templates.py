@@ -0,0 +1,25 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase
+
+from yatube.warmup import warm_up_templates
+
+
+class TemplateWarmUpTests(TestCase):
+    def test_all_project_templates_are_cached(self):
+        loader = engines.all()[0].engine.template_loaders[0]
+        loader.reset()
+        loaded = warm_up_templates()
+        self.assertGreaterEqual(loaded, 25)
+        cached = set(loader.get_template_cache)
+        for name in ('index.html', 'includes/post_item.html',
+                     'emails/digest.txt'):
+            self.assertIn(name, cached)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_templates', '--repeat', '2', stdout=out)
+        for name in ('include', 'inline', 'index.html'):
+            self.assertIn(name, out.getvalue())
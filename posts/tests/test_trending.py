@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from posts.models import Comment, Follow, Post, TrendingPost
+from posts.trending import trending_posts, update_trending
+from posts.utils import keep_dates
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user')
+        cls.author = User.objects.create(username='test_author')
+        cls.quiet = Post.objects.create(author=cls.author, text='Тихий')
+        cls.discussed = Post.objects.create(author=cls.author,
+                                            text='Обсуждаемый')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def comment(self, post, count, created=None):
+        with keep_dates():
+            Comment.objects.bulk_create(
+                Comment(post=post, author=self.user, text=str(i),
+                        created=created or timezone.now())
+                for i in range(count))
+
+    def test_comments_raise_post_in_trending(self):
+        self.comment(self.discussed, 5)
+        update_trending()
+        self.assertEqual(list(trending_posts())[:2],
+                         [self.discussed, self.quiet])
+
+    def test_recent_activity_beats_old_activity(self):
+        self.comment(self.quiet, 5, timezone.now() - timedelta(hours=48))
+        self.comment(self.discussed, 2)
+        update_trending()
+        self.assertEqual(trending_posts().first(), self.discussed)
+
+    def test_follower_reach_counts(self):
+        followed = User.objects.create(username='followed')
+        for i in range(20):
+            Follow.objects.create(
+                user=User.objects.create(username=f'follower_{i}'),
+                author=followed)
+        post = Post.objects.create(author=followed, text='Охват')
+        update_trending()
+        self.assertEqual(trending_posts().first(), post)
+
+    def test_update_is_incremental(self):
+        update_trending()
+        quiet_score = TrendingPost.objects.get(post=self.quiet).score
+        self.assertEqual(update_trending(), 0)
+        self.comment(self.discussed, 1)
+        self.assertEqual(update_trending(), 1)
+        self.assertEqual(TrendingPost.objects.get(post=self.quiet).score,
+                         quiet_score)
+
+    def test_stale_posts_are_pruned(self):
+        update_trending()
+        update_trending(now=timezone.now() + timedelta(days=30))
+        self.assertFalse(TrendingPost.objects.exists())
+
+    def test_trending_page_is_a_single_read(self):
+        self.comment(self.discussed, 3)
+        update_trending()
+        # Запрос количества для паджинатора и запрос страницы
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(reverse('posts:trending'))
+        self.assertEqual(len(queries), 2)
+        # Комментарии не считаются на каждый запрос
+        self.assertNotIn('GROUP BY', queries[1]['sql'])
+        self.assertEqual(len(response.context['page']), 2)
+        self.assertContains(response, 'Комментариев: 3')
+
+    def test_comment_enqueues_trending_update(self):
+        client = Client()
+        client.force_login(self.user)
+        now = timezone.now()
+        for text in ('Первый', 'Второй'):
+            with mock.patch('posts.views.timezone.now', return_value=now):
+                client.post(reverse('posts:add_comment',
+                                    args=[self.author.username,
+                                          self.discussed.id]),
+                            data={'text': text})
+        self.assertEqual(
+            Job.objects.filter(name='posts.update_trending').count(), 1)
@@ -1,22 +1,15 @@
-import shutil
-import tempfile
-
 from django import forms
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import caches
 from django.core.cache.utils import make_template_fragment_key
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 
 from posts.models import Follow, Group, Post
-from yatube.settings import BASE_DIR, MEDIA_ROOT
 
 User = get_user_model()
 
-MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 
 class CustomErrorHandlerTests(TestCase):
     def setUp(self):
@@ -51,7 +44,6 @@ class StaticViewsTests(TestCase):
                 self.assertTemplateUsed(response, template)
 
 
-@override_settings(MEDIA_ROOT=MEDIA_ROOT)
 class PostPagesTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -109,11 +101,6 @@ class PostPagesTests(TestCase):
 
         }
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def test_index_page_cache(self):
         """Тестируем кэштрование данных на странице index.html"""
         cache = caches['default']
@@ -223,11 +210,15 @@ class PaginatorViewsTest(TestCase):
         Post.objects.bulk_create(posts)
 
     def setUp(self):
+        caches['default'].clear()
         # Создаем авторизованного клиента
         self.authorized_client = Client()
         # Авторизуем пользователя
         self.authorized_client.force_login(self.user)
 
+    def tearDown(self):
+        caches['default'].clear()
+
     def test_first_page_contains_ten_records(self):
         """Проверка, что 1 страница содержит 10 записей"""
         response = self.authorized_client.get(reverse('posts:index'))
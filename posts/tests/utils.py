@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Проверки бюджета SQL-запросов и времени рендеринга страниц."""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_seconds=None):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            yield queries
+            elapsed = time.perf_counter() - start
+        sql = '\n'.join(query['sql'] for query in queries.captured_queries)
+        self.assertLessEqual(
+            len(queries), max_queries,
+            f'Выполнено {len(queries)} запросов вместо {max_queries}:\n{sql}')
+        if max_seconds is not None:
+            self.assertLessEqual(
+                elapsed, max_seconds,
+                f'Страница рендерилась {elapsed:.3f} с, '
+                f'бюджет {max_seconds} с')
+
+    def assertConstantQueries(self, client, url, fill, sizes,
+                              max_queries, max_seconds=None, warm_up=False):
+        """Число запросов не растёт вместе с количеством постов.
+
+        fill(size) догружает данные до нужного объёма перед замером.
+        С warm_up=True перед замером делается запрос, прогревающий общие
+        кэши, иначе замеряется холодный запрос.
+        """
+        counts = {}
+        for size in sizes:
+            fill(size)
+            if warm_up:
+                client.get(url)
+            with self.assertQueryBudget(max_queries, max_seconds) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts[size] = len(queries)
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'Число запросов к {url} зависит от объёма данных: {counts}')
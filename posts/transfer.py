@@ -0,0 +1,35 @@
+"""Описание формата JSONL для export_posts / import_posts.
+
+Каждая строка — объект с ключом ``model`` и значениями полей. Модели идут
+в порядке зависимостей, поэтому импорт можно вести одним проходом.
+"""
+import datetime
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+MODELS = OrderedDict((
+    ('user', (User, ('id', 'username', 'password', 'email', 'first_name',
+                     'last_name', 'is_active', 'is_staff', 'is_superuser',
+                     'date_joined', 'last_login'))),
+    ('group', (Group, ('id', 'title', 'slug', 'description'))),
+    ('post', (Post, ('id', 'text', 'pub_date', 'author_id', 'group_id',
+                     'image', 'status', 'publish_at'))),
+    ('comment', (Comment, ('id', 'post_id', 'author_id', 'text',
+                           'created'))),
+    ('follow', (Follow, ('id', 'user_id', 'author_id'))),
+))
+
+
+class TransferEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder обрезает время до миллисекунд, здесь — без потерь."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
@@ -0,0 +1,134 @@
+"""Рейтинг ленты «Популярное».
+
+Каждое событие — публикация поста или комментарий к нему — добавляет посту
+вес, который затухает экспоненциально с постоянной TRENDING_DECAY_HOURS.
+Вместо того чтобы уменьшать все рейтинги с течением времени, храним
+логарифм веса, приведённого к общей точке отсчёта:
+
+    score = log(sum(weight * exp(t_event / decay)))
+
+Порядок постов по такому score совпадает с порядком по затухшему весу в
+любой момент времени, поэтому старые строки пересчитывать не нужно:
+периодическая задача только добавляет новые события к затронутым постам.
+"""
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Comment, Post, TrendingPost, TrendingState
+
+
+def decay_seconds():
+    return settings.TRENDING_DECAY_HOURS * 3600
+
+
+def event_score(moment, weight):
+    return math.log(weight) + moment.timestamp() / decay_seconds()
+
+
+def add_scores(first, second):
+    """log(exp(first) + exp(second)) без переполнения."""
+    if first is None:
+        return second
+    high, low = max(first, second), min(first, second)
+    return high + math.log1p(math.exp(low - high))
+
+
+def prune_threshold(now):
+    # Слабее, чем одиночное событие веса 1 давностью TRENDING_KEEP_HOURS
+    return event_score(
+        now - timedelta(hours=settings.TRENDING_KEEP_HOURS), 1)
+
+
+def publication_events(posts):
+    """Событие публикации для каждого поста из posts.
+
+    Новый пост получает вес по охвату: числу подписчиков автора.
+    """
+    return posts.annotate(reach=Count('author__following')).order_by(
+        'id').values_list('id', 'pub_date', 'reach')
+
+
+def save_scores(events, threshold):
+    """Добавляет события {post_id: score} к рейтингу постов и обновляет
+    у них число комментариев."""
+    current = dict(TrendingPost.objects.filter(
+        post_id__in=events).values_list('post_id', 'score'))
+    comment_counts = dict(Comment.objects.filter(
+        post_id__in=events).order_by().values('post_id').annotate(
+        count=Count('id')).values_list('post_id', 'count'))
+    rows = [
+        TrendingPost(post_id=post_id,
+                     score=add_scores(current.get(post_id), score),
+                     comment_count=comment_counts.get(post_id, 0))
+        for post_id, score in events.items()
+    ]
+    rows = [row for row in rows if row.score >= threshold]
+    TrendingPost.objects.filter(post_id__in=events).delete()
+    TrendingPost.objects.bulk_create(rows)
+
+
+def update_trending(now=None, batch_size=5000):
+    """Добавляет в рейтинг новые посты и комментарии, возвращает число
+    затронутых постов."""
+    now = now or timezone.now()
+    state, _ = TrendingState.objects.get_or_create(pk=1)
+    events = {}
+
+    # Черновики и отложенные посты пропускаются: их добавит
+    # score_published, когда они выйдут
+    posts = publication_events(Post.objects.published().filter(
+        id__gt=state.last_post_id))[:batch_size]
+    for post_id, pub_date, reach in posts:
+        events[post_id] = add_scores(
+            events.get(post_id), event_score(pub_date, 1 + math.log1p(reach)))
+        state.last_post_id = post_id
+
+    comments = Comment.objects.filter(
+        id__gt=state.last_comment_id, post__isnull=False).order_by(
+        'id').values_list('id', 'post_id', 'created')[:batch_size]
+    for comment_id, post_id, created in comments:
+        events[post_id] = add_scores(
+            events.get(post_id),
+            event_score(created, settings.TRENDING_COMMENT_WEIGHT))
+        state.last_comment_id = comment_id
+
+    threshold = prune_threshold(now)
+    with transaction.atomic():
+        if events:
+            save_scores(events, threshold)
+        TrendingPost.objects.filter(score__lt=threshold).delete()
+        state.save()
+    return len(events)
+
+
+def score_published(post_ids, now=None):
+    """Добавляет событие публикации постам, вышедшим из черновиков или по
+    расписанию.
+
+    Посты с id выше last_post_id ещё подберёт update_trending, здесь
+    считаются только те, мимо которых он уже прошёл.
+    """
+    state = TrendingState.objects.filter(pk=1).first()
+    if state is None:
+        return
+    posts = publication_events(Post.objects.published().filter(
+        id__in=post_ids, id__lte=state.last_post_id))
+    events = {post_id: event_score(pub_date, 1 + math.log1p(reach))
+              for post_id, pub_date, reach in posts}
+    if events:
+        with transaction.atomic():
+            save_scores(events, prune_threshold(now or timezone.now()))
+
+
+def trending_posts():
+    """Лента «Популярное» одним чтением по индексу рейтинга: число
+    комментариев хранится в TrendingPost, а не считается на запрос."""
+    return Post.objects.published().select_related(
+        'author', 'group').filter(trending__isnull=False).annotate(
+        comment_count=F('trending__comment_count')).order_by(
+        '-trending__score')
@@ -6,12 +6,16 @@ app_name = 'posts'
 
 urlpatterns = [
     path("", views.index, name='index'),
+    path("trending/", views.trending, name='trending'),
+    path("groups/", views.group_list, name='group_list'),
     path("group/<slug:slug>", views.group_posts, name='group_slug'),
     path("new/", views.new_post, name="new_post"),
+    path("drafts/", views.drafts, name="drafts"),
     path("404/", views.page_not_found, name='404'),
     path("500/", views.server_error, name='500'),
     # Профайл пользователя
     path("follow/", views.follow_index, name="follow_index"),
+    path("follow/import/", views.follow_import, name="follow_import"),
     path("<str:username>/", views.profile, name='profile'),
     # Просмотр записи
     path("<str:username>/<int:post_id>/", views.post_view, name='post'),
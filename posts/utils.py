@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+
+from .models import Comment, Post
+
+
+@contextmanager
+def keep_dates():
+    """Временно отключает auto_now_add у дат постов и комментариев.
+
+    Нужно для массовой загрузки (сиды, импорт), где даты приходят из данных.
+    Иначе их не передать: bulk_create вызывает pre_save, и auto_now_add
+    затирает заданную дату текущим временем.
+
+    Меняются общие для всего процесса объекты полей, поэтому пока блок
+    открыт, любое сохранение поста или комментария в другом потоке тоже
+    оставит дату пустой или чужой. Только для однопоточных management-
+    команд и тестов; из представлений и воркеров не вызывать.
+    """
+    fields = [Post._meta.get_field('pub_date'),
+              Comment._meta.get_field('created')]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
@@ -1,74 +1,126 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.shortcuts import (HttpResponse, get_object_or_404, redirect,
                               render, reverse)
+from django.utils import timezone
+
+from jobs.queue import enqueue
+from posts.archive import ArchiveChain
+from posts.cache import (counted_paginator, feed_count_key, following_ids,
+                         group_directory)
+from posts.following import follow_many, unfollow_many
+from posts.forms import CommentForm, FollowImportForm, PostForm, PublishForm
+from posts.partitions import MonthlyFeed
+from posts.publishing import apply_status, schedule_publishing
+from posts.ratelimit import ratelimit
+from posts.recommendations import suggestions_for
+from posts.streaming import stream_render
+from posts.trending import score_published, trending_posts
+
+from .models import ArchivedPost, Follow, Group, Post
 
-from posts.forms import CommentForm, PostForm
+User = get_user_model()
 
-from .models import Comment, Follow, Group, Post
 
-User = get_user_model()
+def enqueue_thumbnail(post):
+    if post.image:
+        enqueue('posts.generate_thumbnail', {'post_id': post.id},
+                key=f'thumbnail:{post.image.name}')
 
 
 def index(request):
-    latest = Post.objects.all()
-    paginator = Paginator(latest, 10)
+    paginator = Paginator(MonthlyFeed(), 10)
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
     return render(request, "index.html",
                   {"page": page, "paginator": paginator})
 
 
+def trending(request):
+    paginator = Paginator(trending_posts(), 10)
+    page_number = request.GET.get('page')
+    page = paginator.get_page(page_number)
+    return render(request, "trending.html",
+                  {"page": page, "paginator": paginator})
+
+
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, 10)
+    posts = group.posts.published().for_feed()
+    paginator = counted_paginator(posts, 10,
+                                  feed_count_key('group', group.id))
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
     return render(request, "group.html",
                   {"group": group, "page": page, "paginator": paginator})
 
 
+def group_list(request):
+    return render(request, "groups.html", {"groups": group_directory()})
+
+
 @login_required
+@ratelimit('new_post')
 def new_post(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
-    if request.method == "POST" and form.is_valid():
+    publish_form = PublishForm(request.POST or None)
+    if (request.method == "POST" and form.is_valid()
+            and publish_form.is_valid()):
         post = form.save(commit=False)
         post.author = request.user
+        apply_status(post, **publish_form.cleaned_data)
         post.save()
+        enqueue_thumbnail(post)
+        schedule_publishing(post)
+        if not post.is_published:
+            return redirect(reverse("posts:drafts"))
         return redirect(reverse("posts:index"))
 
-    return render(request, 'new.html', {'form': form})
+    return render(request, 'new.html',
+                  {'form': form, 'publish_form': publish_form})
 
 
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
+    posts = ArchiveChain(author.posts.published().for_feed(),
+                         author.archived_posts.for_feed())
     paginator = Paginator(posts, 10)
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
-    if (request.user.id is not None
-            and Follow.objects.filter(author_id=author.id).exists()):
-        return render(request, 'profile.html',
-                      {'author': author, "page": page, "paginator": paginator,
-                       "posts": posts, 'following': 'True'})
-    else:
-        return render(request, 'profile.html',
-                      {'author': author, "page": page, "paginator": paginator,
-                       "posts": posts})
+    suggestions = None
+    if request.user.is_authenticated:
+        suggestions = suggestions_for(request.user)
+    following = author.id in following_ids(request.user)
+    return render(request, 'profile.html',
+                  {'author': author, "page": page, "paginator": paginator,
+                   "posts": posts, 'following': following,
+                   'suggestions': suggestions})
 
 
 def post_view(request, username, post_id):
     author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    post = get_object_or_404(Post, id=post_id)
+    posts = author.posts.published()
+    post = Post.objects.for_feed().filter(id=post_id).first()
+    if post is not None and not post.is_published:
+        # Черновики и запланированные посты видны только автору
+        if request.user != post.author:
+            post = None
+    if post is None:
+        # Старые посты перенесены в архив, см. posts.archive
+        post = get_object_or_404(ArchivedPost.objects.for_feed(), id=post_id)
     form = CommentForm()
-    comments = Comment.objects.filter(post=post)
-
-    return render(request, 'post.html',
-                  {"author": author, "post": post, "posts": posts,
-                   "form": form, "comments": comments})
+    comments = post.comments.select_related('author')
+    context = {"author": author, "post": post, "posts": posts,
+               "form": form, "comments": comments}
+    if post.comment_count > settings.STREAM_COMMENTS_THRESHOLD:
+        # Длинное обсуждение: шапка и пост уходят сразу, комментарии
+        # читаются курсором по мере отдачи
+        return stream_render(request, 'post.html', context, comments,
+                             'includes/comment.html',
+                             settings.STREAM_CHUNK_SIZE)
+    return render(request, 'post.html', context)
 
 
 @login_required
@@ -81,15 +133,33 @@ def post_edit(request, username, post_id):
             'posts:post',
             kwargs={'username': post.author, 'post_id': post.id})
         )
-    if request.method == 'POST' and form.is_valid():
-        form.save()
+    # Время публикации меняется, пока пост не вышел в ленту
+    publish_form = None
+    if not post.is_published:
+        publish_form = PublishForm(
+            request.POST or None,
+            initial={'draft': post.status == Post.DRAFT,
+                     'publish_at': post.publish_at})
+    if (request.method == 'POST' and form.is_valid()
+            and (publish_form is None or publish_form.is_valid())):
+        post = form.save(commit=False)
+        published = (publish_form is not None and apply_status(
+            post, **publish_form.cleaned_data))
+        post.save()
+        if published:
+            score_published([post.id])
+        enqueue_thumbnail(post)
+        schedule_publishing(post)
         return redirect('posts:post', post.author, post.id)
-    return render(request, 'post_edit.html', {'form': form, 'post': post})
+    return render(request, 'post_edit.html',
+                  {'form': form, 'post': post, 'publish_form': publish_form})
 
 
 @login_required
+@ratelimit('add_comment')
 def add_comment(request, username, post_id):
-    post = get_object_or_404(Post, author__username=username, id=post_id)
+    post = get_object_or_404(Post.objects.published(),
+                             author__username=username, id=post_id)
     form = CommentForm(request.POST or None)
     if request.method != "POST" or not form.is_valid():
         return redirect('posts:post', post.author, post.id)
@@ -97,6 +167,9 @@ def add_comment(request, username, post_id):
     comment.post = post
     comment.author = request.user
     comment.save()
+    # Не больше одного пересчёта рейтинга в минуту
+    enqueue('posts.update_trending',
+            key=f'trending:{timezone.now():%Y%m%d%H%M}')
     return redirect(reverse("posts:post", args=[post.author, post.id]))
 
 
@@ -116,17 +189,33 @@ def server_error(request):
 
 
 @login_required
-def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
+def drafts(request):
+    posts = request.user.posts.exclude(
+        status=Post.PUBLISHED).for_feed().order_by('publish_at', '-pub_date')
     paginator = Paginator(posts, 10)
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
+    return render(request, "drafts.html",
+                  {"page": page, "paginator": paginator})
+
+
+@login_required
+def follow_index(request):
+    posts = Post.objects.filter(
+        author__following__user=request.user).published().for_feed()
+    # Новые посты авторов ключ не сбрасывают: число обновится по таймауту
+    paginator = counted_paginator(posts, 10,
+                                  feed_count_key('follow', request.user.id))
+    page_number = request.GET.get('page')
+    page = paginator.get_page(page_number)
 
     return render(request, "follow.html",
-                  {"page": page, "paginator": paginator})
+                  {"page": page, "paginator": paginator,
+                   "suggestions": suggestions_for(request.user)})
 
 
 @login_required
+@ratelimit('profile_follow', methods=None)
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
     if request.user != author:
@@ -136,6 +225,22 @@ def profile_follow(request, username):
         return HttpResponse('Вы не можете подписаться на самого себя!')
 
 
+@login_required
+@ratelimit('follow_import')
+def follow_import(request):
+    form = FollowImportForm(request.POST or None)
+    result = None
+    if request.method == 'POST' and form.is_valid():
+        usernames = form.cleaned_data['usernames']
+        if form.cleaned_data['unfollow']:
+            result = {'unfollowed': unfollow_many(request.user, usernames)}
+        else:
+            followed, missing = follow_many(request.user, usernames)
+            result = {'followed': followed, 'missing': missing}
+    return render(request, 'follow_import.html',
+                  {'form': form, 'result': result})
+
+
 @login_required
 def profile_unfollow(request, username):
     follow_user = get_object_or_404(User, username=username)
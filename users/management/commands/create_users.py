@@ -0,0 +1,93 @@
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+User = get_user_model()
+
+FIELDS = ('username', 'email', 'password', 'first_name', 'last_name')
+
+
+def read_rows(path):
+    """Строки CSV с колонками из FIELDS; username и password обязательны."""
+    with open(path, encoding='utf-8', newline='') as source:
+        for line, row in enumerate(csv.DictReader(source), start=2):
+            if not row.get('username') or not row.get('password'):
+                raise CommandError(
+                    f'Строка {line}: нужны username и password')
+            yield {field: (row.get(field) or '').strip()
+                   for field in FIELDS}
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+    help = ('Создаёт пользователей из CSV (username, email, password, '
+            'first_name, last_name). Пароли хэшируются в нескольких '
+            'процессах, пользователи вставляются пачками.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV-файл с заголовком.')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Пользователей в одной транзакции.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Процессов для хэширования; по умолчанию '
+                                 'по числу ядер, 1 — без пула.')
+        parser.add_argument('--validate', action='store_true',
+                            help='Проверять пароли AUTH_PASSWORD_VALIDATORS.')
+
+    def handle(self, *args, **options):
+        rows = list({row['username']: row
+                     for row in read_rows(options['input'])}.values())
+        existing = set()
+        for chunk in chunks([row['username'] for row in rows], 500):
+            existing.update(User.objects.filter(
+                username__in=chunk).values_list('username', flat=True))
+        rows = [row for row in rows if row['username'] not in existing]
+        if options['validate']:
+            self.validate(rows)
+
+        passwords = self.hash_passwords(
+            [row['password'] for row in rows], options['workers'])
+        created = 0
+        for chunk in chunks(list(zip(rows, passwords)),
+                            options['batch_size']):
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    User(**dict(row, password=password))
+                    for row, password in chunk)
+            created += len(chunk)
+        self.stdout.write(f'Создано пользователей: {created}, '
+                          f'уже существовали: {len(existing)}')
+
+    def validate(self, rows):
+        errors = []
+        for row in rows:
+            try:
+                validate_password(row['password'], User(**row))
+            except ValidationError as error:
+                errors.append(f'{row["username"]}: {" ".join(error)}')
+        if errors:
+            raise CommandError('\n'.join(errors))
+
+    def hash_passwords(self, passwords, workers):
+        # Процесс пула (например, воркер manage.py test --parallel) не
+        # может запускать свои процессы
+        if (workers == 1 or len(passwords) < 2
+                or multiprocessing.current_process().daemon):
+            return [make_password(password) for password in passwords]
+        # Хэширование занимает процессор, поэтому процессы, а не потоки;
+        # при запуске через spawn дочерним процессам нужен django.setup()
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=django.setup) as pool:
+            return list(pool.map(make_password, passwords, chunksize=64))
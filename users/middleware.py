@@ -0,0 +1,64 @@
+"""Пользователь запроса из кэша.
+
+Стандартный AuthenticationMiddleware загружает пользователя из базы на
+каждом запросе. Здесь объект пользователя кэшируется по id, а проверка
+хэша сессии (смена пароля разлогинивает), бэкенда и is_active
+выполняется без запроса. Кэш сбрасывается при сохранении и удалении
+пользователя (users.signals); изменения через QuerySet.update() сигналов
+не шлют и видны только по истечении USER_CACHE_TIMEOUT.
+
+Кэш пользователей работает, только если USER_CACHE_TIMEOUT не ноль, и
+годится лишь для кэша, общего для всех процессов: иначе сброс дойдёт
+только до процесса, который сохранил пользователя.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY)
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def user_cache_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def get_cached_user(request):
+    """Как django.contrib.auth.get_user, но без запроса при тёплом кэше."""
+    user_id = request.session.get(SESSION_KEY)
+    backend_path = request.session.get(BACKEND_SESSION_KEY)
+    if (user_id is None or not settings.USER_CACHE_TIMEOUT
+            or backend_path not in settings.AUTHENTICATION_BACKENDS):
+        return auth.get_user(request)
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+    # Те же проверки, что у auth.get_user, но над объектом из кэша
+    backend = auth.load_backend(backend_path)
+    can_authenticate = getattr(backend, 'user_can_authenticate', None)
+    if not (can_authenticate(user) if can_authenticate else user.is_active):
+        invalidate_user(user_id)
+        return AnonymousUser()
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(
+            session_hash, user.get_session_auth_hash()):
+        request.session.flush()
+        return AnonymousUser()
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        # Один объект на запрос; из кэша или базы — при первом обращении
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
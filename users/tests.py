@@ -0,0 +1,127 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.middleware import user_cache_key
+
+User = get_user_model()
+
+
+# Как в продакшене с общим кэшем; у каждого тестового процесса своя база,
+# так что кэша процесса здесь хватает
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    USER_CACHE_TIMEOUT=60 * 5)
+class CachedSessionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user',
+                                            password='secret-123')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def session_and_user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+        return [query['sql'] for query in queries
+                if 'django_session' in query['sql']
+                or query['sql'].startswith('SELECT "auth_user"')]
+
+    def test_warm_request_needs_no_session_or_user_queries(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        self.assertEqual(self.session_and_user_queries(url), [])
+
+    def test_user_changes_are_picked_up(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        self.user.first_name = 'Новое'
+        self.user.save()
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.context['user'].first_name, 'Новое')
+
+    def test_password_change_logs_out_other_sessions(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('another-456')
+        user.save()
+        # Новый вход кладёт в кэш пользователя с новым хэшем пароля
+        another_client = Client()
+        another_client.force_login(user)
+        another_client.get(url)
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivated_user_is_logged_out(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.authorized_client.get(url).status_code, 302)
+
+    def test_inactive_cached_user_is_rejected(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        user = cache.get(user_cache_key(self.user.pk))
+        user.is_active = False
+        cache.set(user_cache_key(self.user.pk), user)
+        self.assertEqual(self.authorized_client.get(url).status_code, 302)
+
+    @override_settings(USER_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        url = reverse('posts:follow_index')
+        self.session_and_user_queries(url)
+        self.assertTrue(self.session_and_user_queries(url))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+
+class CreateUsersCommandTests(TestCase):
+    def setUp(self):
+        source = tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', encoding='utf-8', delete=False)
+        with source:
+            source.write('username,email,password,first_name\n'
+                         'alice,alice@example.com,Str0ng-pass-1,Алиса\n'
+                         'bob,,Str0ng-pass-2,\n'
+                         'carol,,Str0ng-pass-3,\n')
+        self.addCleanup(os.remove, source.name)
+        self.path = source.name
+
+    def test_users_are_created_with_hashed_passwords(self):
+        User.objects.create_user(username='carol', password='old-pass-1')
+        out = StringIO()
+        call_command('create_users', self.path, '--workers', '2',
+                     '--batch-size', '1', stdout=out)
+        self.assertIn('Создано пользователей: 2, уже существовали: 1',
+                      out.getvalue())
+        alice = User.objects.get(username='alice')
+        self.assertEqual(alice.first_name, 'Алиса')
+        self.assertTrue(alice.check_password('Str0ng-pass-1'))
+        self.assertTrue(User.objects.get(username='carol').check_password(
+            'old-pass-1'))
+
+    def test_weak_passwords_are_rejected(self):
+        with open(self.path, 'a', encoding='utf-8') as source:
+            source.write('dave,,123,\n')
+        with self.assertRaises(CommandError):
+            call_command('create_users', self.path, '--workers', '1',
+                         '--validate', stdout=StringIO())
+        self.assertFalse(User.objects.exists())
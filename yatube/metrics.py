@@ -0,0 +1,190 @@
+"""Лёгкие метрики запросов для production.
+
+Middleware собирает по каждому имени URL количество SQL-запросов, время
+работы с БД, время рендеринга шаблонов и размер ответа, складывает их в
+гистограммы в памяти процесса и отдаёт в текстовом формате Prometheus.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+# Границы корзин гистограмм (верхние, включительно), как в Prometheus
+BUCKETS = OrderedDict((
+    ('request_duration_seconds',
+     (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)),
+    ('db_queries', (1, 2, 5, 10, 20, 50, 100, 200)),
+    ('db_duration_seconds',
+     (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)),
+    ('template_duration_seconds',
+     (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)),
+    ('response_size_bytes',
+     (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)),
+))
+
+UNRESOLVED = '<unresolved>'
+
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, view_name, values):
+        with self._lock:
+            for metric, value in values.items():
+                key = (metric, view_name)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(BUCKETS[metric])
+                    self._histograms[key] = histogram
+                histogram.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def get(self, metric, view_name):
+        return self._histograms.get((metric, view_name))
+
+    def export(self):
+        lines = []
+        with self._lock:
+            for metric in BUCKETS:
+                name = f'yatube_{metric}'
+                lines.append(f'# TYPE {name} histogram')
+                for (key, view_name), histogram in sorted(
+                        self._histograms.items()):
+                    if key != metric:
+                        continue
+                    label = f'view="{view_name}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{bound}"}} {total}')
+                    lines.append(
+                        f'{name}_bucket{{{label},le="+Inf"}} '
+                        f'{histogram.count}')
+                    lines.append(f'{name}_sum{{{label}}} {histogram.sum}')
+                    lines.append(
+                        f'{name}_count{{{label}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0
+        self.template_time = 0
+        self.template_depth = 0
+
+    def track_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def current_stats():
+    return getattr(_local, 'stats', None)
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = current_stats()
+        if stats is None:
+            return super().render(context, request)
+        # Вложенный render_to_string уже учтён во внешнем шаблоне
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Шаблонизатор Django, замеряющий время рендеринга шаблонов."""
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return InstrumentedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
+
+
+def get_view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        _local.stats = stats
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats.track_query):
+                response = self.get_response(request)
+        finally:
+            _local.stats = None
+        values = {
+            'request_duration_seconds': time.perf_counter() - start,
+            'db_queries': stats.queries,
+            'db_duration_seconds': stats.db_time,
+            'template_duration_seconds': stats.template_time,
+        }
+        if not response.streaming:
+            values['response_size_bytes'] = len(response.content)
+        registry.observe(get_view_name(request), values)
+        return response
+
+
+def metrics(request):
+    # Метрики отдаём только внутренним адресам и персоналу
+    if (request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS
+            and not request.user.is_staff):
+        raise Http404
+    return HttpResponse(registry.export(),
+                        content_type='text/plain; version=0.0.4')
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'posts',
     'users',
     'about',
+    'jobs',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -45,21 +46,21 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'sorl.thumbnail',
-    'debug_toolbar'
 ]
 
 MIDDLEWARE = [
+    'yatube.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware'
 ]
 
-# Добавьте IP адреса при обращении с которых будет доступен инструмент
+# Добавьте IP адреса при обращении с которых будут доступны
+# debug toolbar (в yatube.settings_dev) и страница /metrics
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -70,15 +71,24 @@ ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates с замером времени рендеринга для /metrics
+        'BACKEND': 'yatube.metrics.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Шаблоны разбираются один раз на процесс и хранятся в памяти;
+            # wsgi.py прогревает их при старте воркера (yatube.warmup)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'posts.context_processors.following',
             ],
         },
     },
@@ -97,6 +107,13 @@ DATABASES = {
 }
 
 # Caches
+# LocMemCache живёт внутри процесса; при нескольких воркерах счётчики
+# ограничения частоты и кэши страниц нужно держать в общем кэше
+# (например, django.core.cache.backends.memcached.PyLibMCCache). Сброс
+# кэша доходит только до своего процесса: с LocMemCache числа постов по
+# месяцам (posts.partitions) в других воркерах до
+# FEED_MONTH_COUNTS_TIMEOUT расходятся с базой, и глобальная лента
+# пропускает или повторяет посты на границах страниц
 
 CACHES = {
     'default': {
@@ -105,6 +122,60 @@ CACHES = {
     }
 }
 
+# Сколько держать в кэше число строк в списках админки (posts.admin)
+ADMIN_COUNT_TIMEOUT = 60 * 5
+
+# Сессии в базе. cached_db (чтение из кэша, запись сразу в кэш и в базу)
+# включать только с кэшем, общим для всех процессов: с LocMemCache выход,
+# flush() сессии или смена пароля удалят её из кэша одного процесса, а
+# остальные будут принимать старую сессию, пока запись не вытеснится
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Пользователь запроса из кэша (users.middleware), 0 — выключено.
+# Включать только с кэшем, общим для всех процессов (Memcached, Redis):
+# LocMemCache у каждого процесса свой, и смена пароля или блокировка
+# сбросят запись только в одном из них
+USER_CACHE_TIMEOUT = 0
+
+# Ограничение частоты пишущих запросов (posts.ratelimit): число запросов
+# за секунду/минуту/час/день отдельно на пользователя и на IP
+RATELIMIT_ENABLED = True
+RATELIMITS = {
+    'new_post': {'user': '10/m', 'ip': '50/m'},
+    'add_comment': {'user': '20/m', 'ip': '100/m'},
+    'profile_follow': {'user': '60/m', 'ip': '300/m'},
+    'follow_import': {'user': '10/h', 'ip': '50/h'},
+}
+
+# Каталог групп с числом постов кэшируется и сбрасывается сигналами;
+# таймаут страхует от изменений в обход сигналов (bulk_create, update)
+GROUP_DIRECTORY_TIMEOUT = 60 * 10
+
+# Лента «Популярное»: время затухания веса события, вес комментария
+# относительно публикации и сколько хранить посты без новых событий
+TRENDING_DECAY_HOURS = 12
+TRENDING_COMMENT_WEIGHT = 1
+TRENDING_KEEP_HOURS = 72
+
+# Множество авторов, на которых подписан пользователь (posts.cache);
+# сбрасывается сигналами при подписке и отписке
+FOLLOWING_TIMEOUT = 60 * 60
+
+# Сколько держать в кэше число постов ленты группы и ленты подписок
+FEED_COUNT_TIMEOUT = 60
+
+# Число постов по месяцам для глобальной ленты (posts.partitions);
+# кэш закрытых месяцев сбрасывается сигналами, таймаут — на bulk_create и
+# на воркеры без общего кэша
+FEED_MONTH_COUNTS_TIMEOUT = 60 * 60
+
+# Страница поста с большим числом комментариев отдаётся потоком
+# (posts.streaming), комментарии читаются из базы пачками
+STREAM_COMMENTS_THRESHOLD = 200
+STREAM_CHUNK_SIZE = 100
+
+# Посты старше этого срока переносятся в архив (manage.py archive_posts)
+ARCHIVE_AFTER_DAYS = 365
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -158,3 +229,11 @@ LOGOUT_REDIRECT_URL = "posts:index"
 
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+
+# Адрес сайта для ссылок в письмах
+SITE_URL = "http://localhost:8000"
+
+# Дайджест новых записей подписок: период по умолчанию и размер пачки
+# получателей (см. python manage.py send_digests)
+DIGEST_PERIOD = "daily"
+DIGEST_BATCH_SIZE = 500
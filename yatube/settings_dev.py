@@ -0,0 +1,21 @@
+"""Настройки для локальной разработки.
+
+Запуск: DJANGO_SETTINGS_MODULE=yatube.settings_dev python manage.py runserver
+"""
+from copy import deepcopy
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = True
+
+# Без кэша шаблонов, чтобы правки подхватывались без перезапуска
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+
+MIDDLEWARE = MIDDLEWARE + ['debug_toolbar.middleware.DebugToolbarMiddleware']
@@ -0,0 +1,27 @@
+"""Настройки для тестов.
+
+Используются по умолчанию в ``python manage.py test`` и pytest.
+"""
+from .settings import *  # noqa: F401,F403
+
+# Тестовая база SQLite целиком в памяти; при --parallel каждый процесс
+# получает свою копию
+DATABASES['default']['TEST'] = {'NAME': ':memory:'}  # noqa: F405
+# Процессы, запущенные из тестов с этими настройками, тоже не трогают
+# db.sqlite3 разработчика
+DATABASES['default']['NAME'] = ':memory:'  # noqa: F405
+
+# PBKDF2 намеренно медленный; в тестах стойкость хэша не нужна
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Картинки и миниатюры не пишутся в MEDIA_ROOT, параллельные процессы
+# друг другу не мешают
+DEFAULT_FILE_STORAGE = 'yatube.storage.MemoryStorage'
+THUMBNAIL_STORAGE = DEFAULT_FILE_STORAGE
+
+# Таблицы создаются прямо по моделям, без прогона всех миграций;
+# соответствие миграций моделям проверяет makemigrations --check
+MIGRATION_MODULES = {
+    app.rsplit('.', 1)[-1]: None
+    for app in INSTALLED_APPS  # noqa: F405
+}
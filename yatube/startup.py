@@ -0,0 +1,79 @@
+"""Замер холодного старта процесса.
+
+Модуль запускается командой profile_startup в чистом интерпретаторе
+(python -X importtime -m yatube.startup URL) и повторяет шаги
+yatube/wsgi.py: django.setup(), загрузка URLconf, прогрев шаблонов и
+первый запрос. Длительности шагов и ready() каждого приложения
+печатаются в stdout как JSON, время импорта модулей интерпретатор пишет
+в stderr.
+"""
+import json
+import sys
+import time
+from io import StringIO
+from wsgiref.util import setup_testing_defaults
+
+
+def time_ready(timings):
+    """Оборачивает ready() каждого создаваемого AppConfig в замер."""
+    from django.apps.config import AppConfig
+
+    create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        app_config = create(cls, entry)
+        ready = app_config.ready
+
+        def timed_ready():
+            start = time.perf_counter()
+            ready()
+            timings[app_config.label] = time.perf_counter() - start
+
+        app_config.ready = timed_ready
+        return app_config
+
+    AppConfig.create = classmethod(timed_create)
+
+
+def first_response(application, url):
+    environ = {'PATH_INFO': url, 'wsgi.errors': StringIO()}
+    setup_testing_defaults(environ)
+    status = []
+    body = application(environ, lambda code, headers: status.append(code))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return status[0]
+
+
+def measure(url):
+    started = time.perf_counter()
+    phases, ready = {}, {}
+
+    def phase(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        phases[name] = time.perf_counter() - start
+        return result
+
+    import django
+    time_ready(ready)
+    phase('django.setup', django.setup)
+
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+
+    from yatube.warmup import warm_up_templates
+    application = phase('wsgi', get_wsgi_application)
+    phase('urls', lambda: get_resolver().url_patterns)
+    phase('templates', warm_up_templates)
+    status = phase('first_response', first_response, application, url)
+    return {'phases': phases, 'ready': ready, 'status': status,
+            'total': time.perf_counter() - started}
+
+
+if __name__ == '__main__':
+    print(json.dumps(measure(sys.argv[1] if len(sys.argv) > 1 else '/')))
@@ -0,0 +1,58 @@
+"""Хранилище файлов в памяти процесса.
+
+Используется в тестах: загруженные картинки и миниатюры не пишутся на
+диск, а у каждого процесса при параллельном запуске свои файлы.
+"""
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+
+
+@deconstructible
+class MemoryStorage(Storage):
+    # Общие для всех экземпляров: sorl-thumbnail создаёт своё хранилище
+    files = {}
+
+    def _open(self, name, mode='rb'):
+        content, _ = self.files[name]
+        return ContentFile(content, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        self.files[name] = (b''.join(content.chunks()), timezone.now())
+        return name
+
+    def delete(self, name):
+        self.files.pop(name, None)
+
+    def exists(self, name):
+        return name in self.files
+
+    def size(self, name):
+        return len(self.files[name][0])
+
+    def get_modified_time(self, name):
+        return self.files[name][1]
+
+    def get_created_time(self, name):
+        return self.files[name][1]
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), []
+        for name in self.files:
+            if not name.startswith(prefix):
+                continue
+            head, sep, tail = name[len(prefix):].partition('/')
+            if sep:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def url(self, name):
+        return settings.MEDIA_URL + filepath_to_uri(name)
@@ -19,6 +19,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from yatube.metrics import metrics
+
 handler404 = "posts.views.page_not_found"  # noqa
 handler500 = "posts.views.server_error"  # noqa
 
@@ -30,6 +32,8 @@ urlpatterns = [
     path("auth/", include("django.contrib.auth.urls")),
     # импорт правил из приложения admin
     path("admin/", admin.site.urls),
+    # метрики запросов в формате Prometheus
+    path("metrics", metrics, name="metrics"),
     # импорт правил из приложения posts
     path("", include("posts.urls", namespace='posts')),
     # импорт правил из приложения about
@@ -49,5 +53,7 @@ if settings.DEBUG:
     urlpatterns += static(
         settings.STATIC_URL, document_root=settings.STATIC_ROOT
     )
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += (path("__debug__/", include(debug_toolbar.urls)),)
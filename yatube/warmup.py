@@ -0,0 +1,54 @@
+"""Прогрев кэша шаблонов при старте воркера.
+
+Кэширующий загрузчик разбирает шаблон при первом обращении к нему, и без
+прогрева эту цену платят первые запросы каждого воркера. warm_up_templates
+заранее загружает все шаблоны проекта и его приложений.
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def template_names(directories):
+    """Имена шаблонов относительно своих каталогов."""
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, '/')
+
+
+def project_template_dirs(engine):
+    """Каталоги шаблонов проекта; шаблоны сторонних пакетов (admin и
+    т.п.) не прогреваются — они нужны редко."""
+    directories = list(engine.dirs) + list(get_app_template_dirs('templates'))
+    base = os.path.join(str(settings.BASE_DIR), '')
+    return [directory for directory in directories
+            if os.path.join(str(directory), '').startswith(base)]
+
+
+def warm_up_templates():
+    """Загружает все шаблоны проекта, возвращает их число."""
+    loaded = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for name in set(template_names(project_template_dirs(engine))):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError:
+                logger.exception('Шаблон %s не разобран', name)
+            else:
+                loaded += 1
+    return loaded